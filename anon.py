@@ -3,35 +3,171 @@ import re
 import random
 import string
 import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Optional, Union
 import numpy as np
 
+class _LRUCache(OrderedDict):
+    """Dict-like cache with a fixed capacity; least-recently-used entries
+    are evicted once maxsize is exceeded."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 class PolishDataAnonymizer:
     """
     Anonymizer specifically designed for Polish language data in pandas DataFrames.
     Handles Polish names, addresses, phone numbers, PESEL, NIP, REGON, and more.
     """
-    
-    def __init__(self, seed: int = 42):
-        """Initialize with Polish-specific patterns and fake data."""
-        random.seed(seed)
-        np.random.seed(seed)
-        self.replacement_cache: Dict[str, str] = {}
+
+    # Default column mappings for common Polish column names
+    _DEFAULT_COLUMN_TYPES = {
+        'imie': 'name',
+        'imię': 'name',
+        'nazwisko': 'name',
+        'nazwa': 'name',
+        'pesel': 'pesel',
+        'nip': 'nip',
+        'telefon': 'phone',
+        'tel': 'phone',
+        'email': 'email',
+        'e-mail': 'email',
+        'adres': 'address',
+        'ulica': 'address',
+        'miasto': 'city',
+        'kod': 'postal',
+        'kod_pocztowy': 'postal',
+        'dowod': 'id',
+        'dowód': 'id',
+    }
+
+    def __init__(self, seed: int = 42, cache_max: int = 1_000_000):
+        """Initialize with Polish-specific patterns and fake data.
+
+        cache_max bounds the replacement cache (LRU eviction) so multi-GB
+        batch runs cannot grow it without limit; replacements stay
+        deterministic within a run as long as the cap is not exceeded.
+        """
+        # Instance-local RNGs: no locking on (or pollution of) the global
+        # random/numpy state, and reproducibility per anonymizer instance
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
+        self.replacement_cache: Dict[str, str] = _LRUCache(cache_max)
         
         # Polish-specific patterns
         self.patterns = {
             'pesel': r'\b\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12][0-9]|3[01])\d{5}\b',
             'nip': r'\b\d{3}-?\d{3}-?\d{2}-?\d{2}\b',
             'regon': r'\b\d{7,14}\b',
-            'polish_phone': r'(\+48\s?)?(?:\d{2,3}[-\s]?\d{3}[-\s]?\d{3}|\d{3}[-\s]?\d{3}[-\s]?\d{3})',
+            # \d{2,3} covers the former \d{3}-first alternative, so a single
+            # branch is enough and the engine never retries a near-miss
+            'polish_phone': r'(?:\+48\s?)?\d{2,3}[-\s]?\d{3}[-\s]?\d{3}',
             'polish_postal': r'\b\d{2}-\d{3}\b',
             'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
             'iban_pl': r'\bPL\d{26}\b',
             'account_number': r'\b\d{26}\b',  # Polish account number
-            'long_numbers': r'\b\d{8,}\b',
+            'long_numbers': r'(?<!\d)\d{8,}(?!\d)',  # digit-run boundaries, no \b re-entry
             'dowod_osobisty': r'\b[A-Z]{3}\s?\d{6}\b',  # Polish ID format
             'paszport': r'\b[A-Z]{2}\d{7}\b',  # Polish passport
         }
+
+        # Precompile patterns once; re-compiling (or re.cache lookups) on every
+        # anonymize_text call is pure overhead on the hot path
+        self.compiled = {
+            key: re.compile(pattern, re.IGNORECASE if key == 'email' else 0)
+            for key, pattern in self.patterns.items()
+        }
+
+        # Single fused scan for anonymize_text: one pass over the text instead
+        # of seven. Specific patterns (PESEL, NIP, phone) come before the
+        # catch-all long_numbers so the most specific category wins.
+        ordered = ['pesel', 'nip', 'polish_phone', 'polish_postal',
+                   'dowod_osobisty', 'email', 'long_numbers']
+        self.master_re = re.compile('|'.join(
+            f'(?P<{key}>{self.patterns[key]})' if key != 'email'
+            else f'(?i:(?P<{key}>{self.patterns[key]}))'
+            for key in ordered
+        ))
+        # Optional Hyperscan prefilter for batch workloads: one SIMD pass
+        # answers "can anything match?" before the exact scan, so clean
+        # text never pays for master_re. HS_FLAG_PREFILTER
+        # over-approximates constructs Hyperscan cannot match exactly
+        # (the long_numbers lookarounds), which keeps a negative answer
+        # sound; anything it lets through is confirmed by master_re. If
+        # the pattern set will not compile, master_re alone already gives
+        # a single-pass scan.
+        self._hs_db = None
+        try:
+            import hyperscan
+        except ImportError:
+            pass
+        else:
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[self.patterns[key].encode() for key in ordered],
+                    ids=list(range(len(ordered))),
+                    flags=[
+                        hyperscan.HS_FLAG_PREFILTER
+                        | hyperscan.HS_FLAG_SINGLEMATCH
+                        | hyperscan.HS_FLAG_UTF8
+                        | (hyperscan.HS_FLAG_CASELESS if key == 'email' else 0)
+                        for key in ordered
+                    ],
+                )
+                self._hs_db = db
+            except Exception:
+                self._hs_db = None
+
+        self.gen = {
+            'pesel': self._generate_fake_pesel,
+            'nip': self._generate_fake_nip,
+            'polish_phone': self._generate_fake_polish_phone,
+            'polish_postal': self._generate_fake_postal_code,
+            'dowod_osobisty': self._generate_fake_id,
+            'email': self._generate_fake_email,
+            'long_numbers': self._generate_fake_number,
+        }
+
+        # Column-level generators keyed by the data types accepted in
+        # anonymize_dataframe's column_config
+        self._type_generators = {
+            'name': self._generate_fake_polish_name,
+            'address': self._generate_fake_address,
+            'city': self._generate_fake_city,
+            'postal': self._generate_fake_postal_code,
+            'pesel': self._generate_fake_pesel,
+            'nip': self._generate_fake_nip,
+            'phone': self._generate_fake_polish_phone,
+            'email': self._generate_fake_email,
+        }
+
+        # Batch (SoA) counterparts keyed by their scalar generator: all
+        # random components for a set of unique values are drawn in single
+        # numpy calls instead of several random.randint calls per value
+        self._batch_generators = {
+            self._generate_fake_pesel: self._generate_fake_pesel_batch,
+            self._generate_fake_nip: self._generate_fake_nip_batch,
+            self._generate_fake_postal_code: self._generate_fake_postal_code_batch,
+        }
         
         # Polish fake names
         self.polish_first_names_male = [
@@ -72,179 +208,214 @@ class PolishDataAnonymizer:
             'Słowackiego', 'Mickiewicza', 'Kościuszki', 'Sienkiewicza'
         ]
     
+    def _cached_gen(self, category: str, original: str, builder) -> str:
+        """Single cache path for all generators.
+
+        Keys are namespaced as "category:original" so the same original seen
+        as two different data types cannot collide on one replacement.
+        """
+        key = f"{category}:{original}"
+        value = self.replacement_cache.get(key)
+        if value is None:
+            value = builder()
+            self.replacement_cache[key] = value
+        return value
+
     def _generate_fake_polish_name(self, original: str) -> str:
         """Generate fake Polish name."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
+        return self._cached_gen('name', original, lambda: self._new_name(original))
+
+    def _new_name(self, original: str) -> str:
         # Simple heuristic: if ends with 'a', assume female
         if original.strip().split()[-1].endswith('a'):
-            first_name = random.choice(self.polish_first_names_female)
+            first_name = self._rng.choice(self.polish_first_names_female)
         else:
-            first_name = random.choice(self.polish_first_names_male)
-        
-        last_name = random.choice(self.polish_last_names)
-        fake_name = f"{first_name} {last_name}"
-        
-        self.replacement_cache[original] = fake_name
-        return fake_name
-    
+            first_name = self._rng.choice(self.polish_first_names_male)
+        last_name = self._rng.choice(self.polish_last_names)
+        return f"{first_name} {last_name}"
+
     def _generate_fake_pesel(self, original: str) -> str:
         """Generate fake PESEL number."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
+        return self._cached_gen('pesel', original, self._new_pesel)
+
+    def _new_pesel(self) -> str:
         # Generate fake PESEL with valid format but fake data
-        year = random.randint(50, 99)  # Birth year
-        month = random.randint(1, 12)
-        day = random.randint(1, 28)
-        serial = random.randint(100, 999)
-        sex = random.randint(0, 9)
-        
+        year = self._rng.randint(50, 99)  # Birth year
+        month = self._rng.randint(1, 12)
+        day = self._rng.randint(1, 28)
+        serial = self._rng.randint(100, 999)
+        sex = self._rng.randint(0, 9)
         # Simple checksum (not real PESEL algorithm)
-        checksum = random.randint(0, 9)
-        
-        fake_pesel = f"{year:02d}{month:02d}{day:02d}{serial}{sex}{checksum}"
-        self.replacement_cache[original] = fake_pesel
-        return fake_pesel
-    
+        checksum = self._rng.randint(0, 9)
+        return f"{year:02d}{month:02d}{day:02d}{serial}{sex}{checksum}"
+
     def _generate_fake_nip(self, original: str) -> str:
         """Generate fake NIP number."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        # Generate fake NIP with format XXX-XXX-XX-XX
-        fake_nip = f"{random.randint(100, 999):03d}-{random.randint(100, 999):03d}-{random.randint(10, 99):02d}-{random.randint(10, 99):02d}"
-        self.replacement_cache[original] = fake_nip
-        return fake_nip
-    
+        # Fake NIP with format XXX-XXX-XX-XX
+        return self._cached_gen('nip', original, lambda: (
+            f"{self._rng.randint(100, 999):03d}-{self._rng.randint(100, 999):03d}"
+            f"-{self._rng.randint(10, 99):02d}-{self._rng.randint(10, 99):02d}"
+        ))
+
+    # Common Polish mobile prefixes
+    _PHONE_PREFIXES = ['501', '502', '503', '505', '506', '507', '508', '509',
+                       '510', '511', '512', '513', '514', '515', '516', '517',
+                       '518', '519', '530', '531', '532', '533', '534', '535',
+                       '536', '537', '538', '539', '570', '571', '572', '573',
+                       '574', '575', '576', '577', '578', '579', '600', '601',
+                       '602', '603', '604', '605', '606', '607', '608', '609']
+
     def _generate_fake_polish_phone(self, original: str) -> str:
         """Generate fake Polish phone number."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        # Common Polish mobile prefixes
-        prefixes = ['501', '502', '503', '505', '506', '507', '508', '509',
-                   '510', '511', '512', '513', '514', '515', '516', '517',
-                   '518', '519', '530', '531', '532', '533', '534', '535',
-                   '536', '537', '538', '539', '570', '571', '572', '573',
-                   '574', '575', '576', '577', '578', '579', '600', '601',
-                   '602', '603', '604', '605', '606', '607', '608', '609']
-        
-        prefix = random.choice(prefixes)
-        number = f"{random.randint(100, 999):03d}-{random.randint(100, 999):03d}"
-        
+        return self._cached_gen('phone', original, lambda: self._new_phone(original))
+
+    def _new_phone(self, original: str) -> str:
+        prefix = self._rng.choice(self._PHONE_PREFIXES)
+        number = f"{self._rng.randint(100, 999):03d}-{self._rng.randint(100, 999):03d}"
         if '+48' in original:
-            fake_phone = f"+48 {prefix}-{number}"
-        else:
-            fake_phone = f"{prefix}-{number}"
-        
-        self.replacement_cache[original] = fake_phone
-        return fake_phone
-    
+            return f"+48 {prefix}-{number}"
+        return f"{prefix}-{number}"
+
     def _generate_fake_address(self, original: str) -> str:
         """Generate fake Polish address."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        street_type = random.choice(self.polish_street_types)
-        street_name = random.choice(self.polish_street_names)
-        house_number = random.randint(1, 200)
-        apartment = random.randint(1, 50) if random.random() > 0.7 else None
-        
+        return self._cached_gen('address', original, self._new_address)
+
+    def _new_address(self) -> str:
+        street_type = self._rng.choice(self.polish_street_types)
+        street_name = self._rng.choice(self.polish_street_names)
+        house_number = self._rng.randint(1, 200)
+        apartment = self._rng.randint(1, 50) if self._rng.random() > 0.7 else None
         if apartment:
-            address = f"{street_type} {street_name} {house_number}/{apartment}"
-        else:
-            address = f"{street_type} {street_name} {house_number}"
-        
-        self.replacement_cache[original] = address
-        return address
-    
+            return f"{street_type} {street_name} {house_number}/{apartment}"
+        return f"{street_type} {street_name} {house_number}"
+
     def _generate_fake_postal_code(self, original: str) -> str:
         """Generate fake Polish postal code."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        fake_postal = f"{random.randint(10, 99):02d}-{random.randint(100, 999):03d}"
-        self.replacement_cache[original] = fake_postal
-        return fake_postal
-    
+        return self._cached_gen('postal', original, lambda: (
+            f"{self._rng.randint(10, 99):02d}-{self._rng.randint(100, 999):03d}"
+        ))
+
     def _generate_fake_city(self, original: str) -> str:
         """Generate fake Polish city."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        fake_city = random.choice(self.polish_cities)
-        self.replacement_cache[original] = fake_city
-        return fake_city
-    
+        return self._cached_gen('city', original,
+                                lambda: self._rng.choice(self.polish_cities))
+
+    _EMAIL_DOMAINS = ['example.pl', 'test.com.pl', 'demo.pl', 'sample.org.pl']
+
     def _generate_fake_email(self, original: str) -> str:
         """Generate fake email."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
-        domains = ['example.pl', 'test.com.pl', 'demo.pl', 'sample.org.pl']
-        username = ''.join(random.choices(string.ascii_lowercase, k=8))
-        fake_email = f"{username}@{random.choice(domains)}"
-        
-        self.replacement_cache[original] = fake_email
-        return fake_email
+        return self._cached_gen('email', original, self._new_email)
+
+    def _new_email(self) -> str:
+        username = ''.join(self._rng.choices(string.ascii_lowercase, k=8))
+        return f"{username}@{self._rng.choice(self._EMAIL_DOMAINS)}"
     
+    def _generate_fake_pesel_batch(self, originals: List[str]) -> List[str]:
+        """Generate fake PESELs for a batch of originals with SoA draws."""
+        cache = self.replacement_cache
+        missing = [o for o in originals if f"pesel:{o}" not in cache]
+        if missing:
+            n = len(missing)
+            rng = self._np_rng
+            years = rng.integers(50, 100, size=n)
+            months = rng.integers(1, 13, size=n)
+            days = rng.integers(1, 29, size=n)
+            serials = rng.integers(100, 1000, size=n)
+            sexes = rng.integers(0, 10, size=n)
+            checksums = rng.integers(0, 10, size=n)
+            for original, y, m, d, s, x, c in zip(
+                    missing, years, months, days, serials, sexes, checksums):
+                cache[f"pesel:{original}"] = f"{y:02d}{m:02d}{d:02d}{s}{x}{c}"
+        return [cache[f"pesel:{o}"] for o in originals]
+
+    def _generate_fake_nip_batch(self, originals: List[str]) -> List[str]:
+        """Generate fake NIPs for a batch of originals with SoA draws."""
+        cache = self.replacement_cache
+        missing = [o for o in originals if f"nip:{o}" not in cache]
+        if missing:
+            n = len(missing)
+            rng = self._np_rng
+            g1 = rng.integers(100, 1000, size=n)
+            g2 = rng.integers(100, 1000, size=n)
+            g3 = rng.integers(10, 100, size=n)
+            g4 = rng.integers(10, 100, size=n)
+            for original, a, b, c, d in zip(missing, g1, g2, g3, g4):
+                cache[f"nip:{original}"] = f"{a:03d}-{b:03d}-{c:02d}-{d:02d}"
+        return [cache[f"nip:{o}"] for o in originals]
+
+    def _generate_fake_postal_code_batch(self, originals: List[str]) -> List[str]:
+        """Generate fake postal codes for a batch of originals with SoA draws."""
+        cache = self.replacement_cache
+        missing = [o for o in originals if f"postal:{o}" not in cache]
+        if missing:
+            n = len(missing)
+            rng = self._np_rng
+            prefixes = rng.integers(10, 100, size=n)
+            suffixes = rng.integers(100, 1000, size=n)
+            for original, p, s in zip(missing, prefixes, suffixes):
+                cache[f"postal:{original}"] = f"{p:02d}-{s:03d}"
+        return [cache[f"postal:{o}"] for o in originals]
+
+    def _generate_fake_id(self, original: str) -> str:
+        """Generate fake Polish ID (dowód osobisty) number."""
+        return f"{self._rng.choice(['ABC', 'DEF', 'GHI'])}{self._rng.randint(100000, 999999):06d}"
+
     def _generate_fake_number(self, original: str) -> str:
         """Generate fake number maintaining length."""
-        if original in self.replacement_cache:
-            return self.replacement_cache[original]
-        
+        return self._cached_gen('number', original, lambda: self._new_number(original))
+
+    def _new_number(self, original: str) -> str:
         length = len(re.sub(r'[^\d]', '', original))
-        fake_number = ''.join([str(random.randint(1, 9))] + 
-                             [str(random.randint(0, 9)) for _ in range(length - 1)])
-        self.replacement_cache[original] = fake_number
-        return fake_number
+        return ''.join([str(self._rng.randint(1, 9))] +
+                       [str(self._rng.randint(0, 9)) for _ in range(length - 1)])
     
+    def _dispatch(self, match: 're.Match') -> str:
+        """Route a master_re match to the generator for its category."""
+        return self.gen[match.lastgroup](match.group(0))
+
+    def _may_match(self, text: str) -> bool:
+        """One Hyperscan pass answering whether any pattern can match."""
+        hit = False
+
+        def on_match(pat_id, start, end, flags, context):
+            nonlocal hit
+            hit = True
+            return 1  # first event is enough; stop the scan
+
+        try:
+            self._hs_db.scan(text.encode('utf-8'), match_event_handler=on_match)
+        except Exception:
+            return True  # scan trouble must not drop entities
+        return hit
+
     def anonymize_text(self, text: str) -> str:
         """Anonymize Polish text."""
         if pd.isna(text) or text == '':
             return text
-        
-        result = str(text)
-        
-        # PESEL numbers
-        def replace_pesel(match):
-            return self._generate_fake_pesel(match.group(0))
-        result = re.sub(self.patterns['pesel'], replace_pesel, result)
-        
-        # NIP numbers
-        def replace_nip(match):
-            return self._generate_fake_nip(match.group(0))
-        result = re.sub(self.patterns['nip'], replace_nip, result)
-        
-        # Polish phone numbers
-        def replace_phone(match):
-            return self._generate_fake_polish_phone(match.group(0))
-        result = re.sub(self.patterns['polish_phone'], replace_phone, result)
-        
-        # Polish postal codes
-        def replace_postal(match):
-            return self._generate_fake_postal_code(match.group(0))
-        result = re.sub(self.patterns['polish_postal'], replace_postal, result)
-        
-        # Email addresses
-        def replace_email(match):
-            return self._generate_fake_email(match.group(0))
-        result = re.sub(self.patterns['email'], replace_email, result, flags=re.IGNORECASE)
-        
-        # ID numbers (Dowód osobisty)
-        def replace_id(match):
-            fake_id = f"{random.choice(['ABC', 'DEF', 'GHI'])}{random.randint(100000, 999999):06d}"
-            return fake_id
-        result = re.sub(self.patterns['dowod_osobisty'], replace_id, result)
-        
-        # Long numbers
-        def replace_long_number(match):
-            return self._generate_fake_number(match.group(0))
-        result = re.sub(self.patterns['long_numbers'], replace_long_number, result)
-        
-        return result
+
+        # The prefilter dismisses clean text in one SIMD pass; everything
+        # else goes through Pattern.sub, which assembles the output in a
+        # single buffer in C, so no intermediate full-text copies are
+        # created per category.
+        text = str(text)
+        if self._hs_db is not None and not self._may_match(text):
+            return text
+        return self.master_re.sub(self._dispatch, text)
+
+    def _map_unique(self, series: pd.Series, generator) -> pd.Series:
+        """Apply a generator once per unique value, then broadcast with map.
+
+        Columns with repeated values (names, cities) hit the generator
+        |unique| times instead of once per row; NaN entries stay NaN.
+        """
+        unique_values = series.dropna().unique()
+        batch_generator = self._batch_generators.get(generator)
+        if batch_generator is not None:
+            originals = [str(value) for value in unique_values]
+            mapping = dict(zip(unique_values, batch_generator(originals)))
+        else:
+            mapping = {value: generator(str(value)) for value in unique_values}
+        return series.map(mapping)
     
     def anonymize_dataframe(self, df: pd.DataFrame, 
                           column_config: Optional[Dict[str, str]] = None,
@@ -261,84 +432,39 @@ class PolishDataAnonymizer:
         Returns:
             Anonymized DataFrame
         """
-        result_df = df.copy()
-        
-        # Default column mappings for common Polish column names
-        default_mappings = {
-            'imie': 'name',
-            'imię': 'name', 
-            'nazwisko': 'name',
-            'nazwa': 'name',
-            'pesel': 'pesel',
-            'nip': 'nip',
-            'telefon': 'phone',
-            'tel': 'phone',
-            'email': 'email',
-            'e-mail': 'email',
-            'adres': 'address',
-            'ulica': 'address',
-            'miasto': 'city',
-            'kod': 'postal',
-            'kod_pocztowy': 'postal',
-            'dowod': 'id',
-            'dowód': 'id',
-        }
-        
         if column_config is None:
             column_config = {}
         
-        # Process each column
-        for column in result_df.columns:
+        # Build the result column-by-column instead of mutating an upfront
+        # df.copy(); source columns are only read, never written, so no
+        # full-frame duplicate is materialized
+        anonymized_columns = {}
+        for column in df.columns:
             column_lower = column.lower()
             data_type = column_config.get(column)
             
-            # Auto-detect data type if not specified
+            # Auto-detect data type if not specified: exact lowercased name
+            # first (one dict lookup), substring scan only on a miss
             if data_type is None and auto_detect:
-                for pattern, detected_type in default_mappings.items():
-                    if pattern in column_lower:
-                        data_type = detected_type
-                        break
+                data_type = self._DEFAULT_COLUMN_TYPES.get(column_lower)
+                if data_type is None:
+                    for token, detected_type in self._DEFAULT_COLUMN_TYPES.items():
+                        if token in column_lower:
+                            data_type = detected_type
+                            break
             
-            # Apply specific anonymization based on data type
-            if data_type == 'name':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_polish_name(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'address':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_address(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'city':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_city(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'postal':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_postal_code(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'pesel':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_pesel(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'nip':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_nip(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'phone':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_polish_phone(str(x)) if pd.notna(x) else x
-                )
-            elif data_type == 'email':
-                result_df[column] = result_df[column].apply(
-                    lambda x: self._generate_fake_email(str(x)) if pd.notna(x) else x
-                )
+            # Apply specific anonymization based on data type; all other
+            # columns get general text anonymization through the vectorized
+            # string accessor (NA entries pass through untouched)
+            generator = self._type_generators.get(data_type)
+            if generator is not None:
+                anonymized_columns[column] = self._map_unique(df[column], generator)
             else:
-                # General text anonymization for all other columns
-                result_df[column] = result_df[column].apply(
-                    lambda x: self.anonymize_text(str(x)) if pd.notna(x) else x
+                anonymized_columns[column] = df[column].astype('string').str.replace(
+                    self.master_re, self._dispatch, regex=True
                 )
-        
-        return result_df
+
+        return pd.DataFrame(anonymized_columns, index=df.index)
     
     def anonymize_column(self, series: pd.Series, data_type: str = 'auto') -> pd.Series:
         """Anonymize a single pandas Series/column."""
@@ -348,16 +474,16 @@ class PolishDataAnonymizer:
             # Basic detection logic here
             data_type = 'text'
         
-        if data_type == 'name':
-            return series.apply(lambda x: self._generate_fake_polish_name(str(x)) if pd.notna(x) else x)
-        elif data_type == 'pesel':
-            return series.apply(lambda x: self._generate_fake_pesel(str(x)) if pd.notna(x) else x)
-        else:
-            return series.apply(lambda x: self.anonymize_text(str(x)) if pd.notna(x) else x)
+        generator = self._type_generators.get(data_type)
+        if generator is not None:
+            return self._map_unique(series, generator)
+        return series.astype('string').str.replace(
+            self.master_re, self._dispatch, regex=True
+        )
     
     def get_replacement_mapping(self) -> Dict[str, str]:
-        """Get the mapping of original -> anonymized values."""
-        return self.replacement_cache.copy()
+        """Get the mapping of "category:original" -> anonymized values."""
+        return dict(self.replacement_cache)
     
     def save_mapping(self, filename: str) -> None:
         """Save replacement mapping to file."""
@@ -48,33 +48,55 @@ def anonymize_specific_columns(df: pd.DataFrame, columns_to_anonymize: list) ->
     
     return result_df
 
+def _process_one_file(file_path: str, output_dir: str, seed: int = 42) -> dict:
+    """Anonymize a single CSV file and return its local replacement mapping.
+
+    Top-level so it can be pickled into worker processes; each worker builds
+    its own anonymizer with the shared seed for reproducible results.
+    """
+    import os
+
+    anonymizer = PolishDataAnonymizer(seed=seed)
+    output_file = os.path.join(output_dir, f"anonymized_{os.path.basename(file_path)}")
+
+    # Stream the CSV so peak memory is bounded by the chunk size; the same
+    # anonymizer instance keeps its replacement cache across chunks, so
+    # repeated values stay consistent within the file
+    first = True
+    for chunk in pd.read_csv(file_path, encoding='utf-8', chunksize=100_000):
+        anonymized = anonymizer.anonymize_dataframe(chunk, auto_detect=True)
+        anonymized.to_csv(output_file, index=False, encoding='utf-8',
+                          mode='w' if first else 'a', header=first)
+        first = False
+
+    print(f"Anonymized: {file_path} -> {output_file}")
+    return anonymizer.get_replacement_mapping()
+
 def batch_anonymize_files(file_paths: list, output_dir: str = 'anonymized/'):
-    """Anonymize multiple CSV files."""
+    """Anonymize multiple CSV files in parallel across CPU cores."""
     import os
-    
+    import json
+    from concurrent.futures import ProcessPoolExecutor
+
     os.makedirs(output_dir, exist_ok=True)
-    anonymizer = PolishDataAnonymizer(seed=42)
-    
-    for file_path in file_paths:
-        try:
-            # Read CSV
-            df = pd.read_csv(file_path, encoding='utf-8')
-            
-            # Anonymize
-            anonymized_df = anonymizer.anonymize_dataframe(df, auto_detect=True)
-            
-            # Save
-            output_file = os.path.join(output_dir, f"anonymized_{os.path.basename(file_path)}")
-            anonymized_df.to_csv(output_file, index=False, encoding='utf-8')
-            
-            print(f"Anonymized: {file_path} -> {output_file}")
-            
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}")
-    
-    # Save mapping
+
+    # Files are independent, so fan out one task per file and merge the
+    # per-worker replacement mappings afterwards
+    merged_mapping = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {executor.submit(_process_one_file, file_path, output_dir): file_path
+                   for file_path in file_paths}
+        for future, file_path in futures.items():
+            try:
+                merged_mapping.update(future.result())
+            except Exception as e:
+                print(f"Error processing {file_path}: {str(e)}")
+
+    # Save merged mapping
     mapping_file = os.path.join(output_dir, 'anonymization_mapping.json')
-    anonymizer.save_mapping(mapping_file)
+    with open(mapping_file, 'w', encoding='utf-8') as f:
+        json.dump(merged_mapping, f, indent=2, ensure_ascii=False)
+    print(f"Mapping saved to {mapping_file}")
 
 # Example usage for your DataFrame:
 if __name__ == "__main__":
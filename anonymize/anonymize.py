@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import re
 from dataclasses import dataclass
@@ -8,6 +9,30 @@ from .detectors import collect_all_matches, Match
 MASK_DIGIT = "X"
 MASK_LETTER = "x"
 
+class _MaskTable(dict):
+    """Translation table for mask_preserve_shape.
+
+    Pre-seeded with ASCII digits/letters; other code points are classified
+    on first sight via isdigit()/isalpha() and cached, so str.translate
+    keeps running in C with at most one Python fallback per unique char.
+    """
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        if ch.isdigit():
+            repl = MASK_DIGIT
+        elif ch.isalpha():
+            repl = MASK_LETTER
+        else:
+            repl = ch
+        self[code] = repl
+        return repl
+
+_MASK_TABLE = _MaskTable(str.maketrans(
+    {**{chr(c): MASK_DIGIT for c in range(48, 58)},
+     **{chr(c): MASK_LETTER for c in range(65, 91)},
+     **{chr(c): MASK_LETTER for c in range(97, 123)}}
+))
+
 @dataclass
 class AnonymizeConfig:
     strategy: str = "placeholder"   # "placeholder" | "preserve_shape" | "hash"
@@ -54,18 +79,15 @@ class AnonymizationResult:
     findings: List[Finding]
 
 def mask_preserve_shape(s: str) -> str:
-    out = []
-    for ch in s:
-        if ch.isdigit():
-            out.append(MASK_DIGIT)
-        elif ch.isalpha():
-            out.append(MASK_LETTER)
-        else:
-            out.append(ch)
-    return ''.join(out)
+    return s.translate(_MASK_TABLE)
 
+@functools.lru_cache(maxsize=1 << 16)
 def pseudo_hash(s: str, salt: str, length: int = 10) -> str:
-    h = hashlib.sha256((salt + "::" + s).encode("utf-8")).hexdigest()
+    # Non-cryptographic pseudonymization: BLAKE2b with a digest just large
+    # enough for the requested prefix is faster than SHA-256, and repeated
+    # PII values (the common case) come straight from the cache.
+    h = hashlib.blake2b((salt + "::" + s).encode("utf-8"),
+                        digest_size=(length + 1) // 2).hexdigest()
     return h[:length]
 
 def replacement_for(category: str, value: str, cfg: AnonymizeConfig) -> str:
@@ -89,10 +111,16 @@ def anonymize_text(text: str, config: Optional[AnonymizeConfig] = None) -> Anony
     findings: List[Finding] = []
     out_parts: List[str] = []
     last = 0
+    # Placeholder replacements are category-constant, so resolve them with a
+    # direct dict lookup instead of re-dispatching on strategy per match
+    placeholder_lookup = cfg.placeholders.get if cfg.strategy == "placeholder" else None
     for m in matches:
         if m.start < last:
             continue
-        repl = replacement_for(m.category, m.value, cfg)
+        if placeholder_lookup is not None:
+            repl = placeholder_lookup(m.category, "[REDACTED]")
+        else:
+            repl = replacement_for(m.category, m.value, cfg)
         out_parts.append(text[last:m.start])
         out_parts.append(repl)
         findings.append(Finding(m.start, m.end, m.category, m.value, repl))
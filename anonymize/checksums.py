@@ -1,56 +1,71 @@
-import string
+from operator import mul
+
+# Doubled-digit lookup for the Luhn "double and subtract 9" step,
+# indexed by digit value
+_LUHN_DOUBLE = bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9])
+
+# ASCII '0'-'9' -> numeric value 0-9. Candidates are translated through
+# this once, after which the weighted sums below run entirely in C via
+# map()/sum() over raw byte values — no per-digit Python arithmetic
+_DIGIT_VALUES = bytes(b - 48 if 48 <= b <= 57 else 0 for b in range(256))
+
+# Every byte except ASCII '0'-'9', used as a bytes.translate delete table
+_NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+def _digit_bytes(value) -> bytes:
+    """Extract the ASCII digits of a str or bytes value as raw byte values."""
+    if isinstance(value, bytes):
+        return value.translate(None, _NON_DIGITS)
+    return value.encode('ascii', 'ignore').translate(None, _NON_DIGITS)
+
+# Checksum weight vectors, hoisted so each call avoids rebuilding the list
+_PESEL_WEIGHTS = (1, 3, 7, 9, 1, 3, 7, 9, 1, 3)
+_NIP_WEIGHTS = (6, 5, 7, 2, 3, 4, 5, 6, 7)
+_REGON9_WEIGHTS = (8, 9, 2, 3, 4, 5, 6, 7)
+_REGON14_WEIGHTS = (2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5, 6)
 
 def luhn_valid(num: str) -> bool:
-    s = ''.join(ch for ch in num if ch.isdigit())
-    if not 13 <= len(s) <= 19:
+    digits = _digit_bytes(num)
+    if not 13 <= len(digits) <= 19:
         return False
-    total = 0
-    reverse = s[::-1]
-    for i, ch in enumerate(reverse):
-        d = ord(ch) - 48
-        if i % 2 == 1:
-            d *= 2
-            if d > 9:
-                d -= 9
-        total += d
+    vals = digits.translate(_DIGIT_VALUES)
+    total = sum(map(_LUHN_DOUBLE.__getitem__, vals[-2::-2])) + sum(vals[-1::-2])
     return total % 10 == 0
 
 def pesel_valid(pesel: str) -> bool:
-    s = ''.join(ch for ch in pesel if ch.isdigit())
-    if len(s) != 11:
+    digits = _digit_bytes(pesel)
+    if len(digits) != 11:
         return False
-    weights = [1, 3, 7, 9, 1, 3, 7, 9, 1, 3]
-    control = sum(int(s[i]) * weights[i] for i in range(10))
-    control = (10 - (control % 10)) % 10
-    return control == int(s[10])
+    vals = digits.translate(_DIGIT_VALUES)
+    control = (10 - sum(map(mul, vals, _PESEL_WEIGHTS)) % 10) % 10
+    return control == vals[10]
 
 def nip_valid(nip: str) -> bool:
-    s = ''.join(ch for ch in nip if ch.isdigit())
-    if len(s) != 10:
+    digits = _digit_bytes(nip)
+    if len(digits) != 10:
         return False
-    weights = [6, 5, 7, 2, 3, 4, 5, 6, 7]
-    control = sum(int(s[i]) * weights[i] for i in range(9)) % 11
+    vals = digits.translate(_DIGIT_VALUES)
+    control = sum(map(mul, vals, _NIP_WEIGHTS)) % 11
     if control == 10:
         return False
-    return control == int(s[9])
+    return control == vals[9]
 
 def regon_valid(regon: str) -> bool:
-    s = ''.join(ch for ch in regon if ch.isdigit())
-    if len(s) == 9:
-        weights = [8, 9, 2, 3, 4, 5, 6, 7]
-        control = sum(int(s[i]) * weights[i] for i in range(8)) % 11
+    digits = _digit_bytes(regon)
+    vals = digits.translate(_DIGIT_VALUES)
+    if len(digits) == 9:
+        control = sum(map(mul, vals, _REGON9_WEIGHTS)) % 11
         if control == 10:
             control = 0
-        return control == int(s[8])
-    elif len(s) == 14:
+        return control == vals[8]
+    elif len(digits) == 14:
         # Validate base 9 first
-        if not regon_valid(s[:9]):
+        if not regon_valid(digits[:9].decode()):
             return False
-        weights = [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5, 6]
-        control = sum(int(s[i]) * weights[i] for i in range(13)) % 11
+        control = sum(map(mul, vals, _REGON14_WEIGHTS)) % 11
         if control == 10:
             control = 0
-        return control == int(s[13])
+        return control == vals[13]
     else:
         return False
 
@@ -63,14 +78,19 @@ def polish_id_card_valid(doc: str) -> bool:
         return False
     if not (s[:3].isalpha() and s[3:].isdigit()):
         return False
-    def char_val(c: str) -> int:
-        if c.isdigit():
-            return ord(c) - 48
-        return 10 + (ord(c) - 65)  # A=10, B=11 ... Z=35
-    weights = [7, 3, 1, 7, 3, 1, 7, 3]
-    positions = [0, 1, 2, 4, 5, 6, 7, 8]
-    total = sum(char_val(s[pos]) * weights[i] for i, pos in enumerate(positions))
-    return total % 10 == int(s[3])
+    try:
+        b = s.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    # Positions 0-2 are letters (A=10 -> byte-55), 4-8 digits (byte-48);
+    # unrolled weighted sum on raw byte values, no per-char int() parsing
+    total = ((b[0] - 55) * 7 + (b[1] - 55) * 3 + (b[2] - 55)
+             + (b[4] - 48) * 7 + (b[5] - 48) * 3 + (b[6] - 48)
+             + (b[7] - 48) * 7 + (b[8] - 48) * 3)
+    return total % 10 == b[3] - 48
+
+# A-Z -> "10".."35" for the IBAN letter expansion
+_IBAN_LETTER_MAP = str.maketrans({chr(c): str(10 + c - 65) for c in range(65, 91)})
 
 def iban_valid(iban: str) -> bool:
     # General IBAN: 15-34 chars, checksum mod 97 == 1
@@ -80,22 +100,10 @@ def iban_valid(iban: str) -> bool:
     # Optional stricter check for PL: length 28 and all digits after country+check
     if raw.startswith("PL") and len(raw) != 28:
         return False
-    rearranged = raw[4:] + raw[:4]
-    # Convert letters
-    def char_to_num(c: str) -> str:
-        if c.isdigit():
-            return c
-        return str(10 + ord(c) - ord('A'))
-    num_str_iter = (char_to_num(c) for c in rearranged)
-    # Streaming mod 97
-    remainder = 0
-    chunk = ""
-    for part in num_str_iter:
-        chunk += part
-        # Process in blocks to keep ints small
-        while len(chunk) >= 7:
-            remainder = int(str(remainder) + chunk[:7]) % 97
-            chunk = chunk[7:]
-    if chunk:
-        remainder = int(str(remainder) + chunk) % 97
-    return remainder == 1
+    # Expand letters to digits in one translate, then a single bigint mod:
+    # CPython's int division is C-level and beats chunked Python-side mod 97
+    rearranged = (raw[4:] + raw[:4]).translate(_IBAN_LETTER_MAP)
+    try:
+        return int(rearranged) % 97 == 1
+    except ValueError:
+        return False
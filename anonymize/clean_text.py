@@ -1,16 +1,47 @@
 import re
 import unicodedata
 
+# Newline normalization in two passes, replacing what used to be three
+# str.replace scans plus a regex: literal backslash escapes first
+# ("\\r\\n" before "\\n"/"\\r" so the pair wins), then every real
+# spelling — CR/CRLF and the Unicode separators NEL, LINE SEP, PARA SEP.
+# The phases cannot be fused into one alternation: a real CR adjacent to
+# a literal escape must merge with the newline the escape produces
+# ("\r" + "\\n" is one newline, not two), which requires the escape
+# conversion to happen first.
+_LITERAL_NEWLINE_RE = re.compile('\\\\r\\\\n|\\\\n|\\\\r')
+_NEWLINE_RE = re.compile('\r\n?|\u0085|\u2028|\u2029')
+
+# Precompiled whitespace-normalization patterns
+_SPACE_RUN_RE = re.compile(r'[^\S\n]+')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+
+class _KeepTable(dict):
+    """Translation table keeping letters, combining marks, space/newline and
+    commas; everything else maps to None (dropped by str.translate).
+
+    Code points are classified once via unicodedata.category and cached, so
+    filtering a large document runs in C with one Python fallback per
+    unique character.
+    """
+    def __missing__(self, code: int):
+        ch = chr(code)
+        if ch in (',', '\n', ' ') or unicodedata.category(ch)[0] in ('L', 'M'):
+            repl = ch
+        else:
+            repl = None
+        self[code] = repl
+        return repl
+
+_KEEP_TABLE = _KeepTable()
+
 def normalize_newlines(text: str) -> str:
     """
     1) Convert visible escape sequences like '\\n' or '\\r\\n' to real newlines.
     2) Normalize all newline variants to \\n, including Unicode separators.
     """
-    # Turn literal backslash-escapes into actual newlines if present
-    text = text.replace('\\r\\n', '\n').replace('\\n', '\n').replace('\\r', '\n')
-    # Normalize CR, CRLF, NEL, LINE SEP, PARA SEP to \n
-    text = re.sub(r'\r\n?|\u0085|\u2028|\u2029', '\n', text)
-    return text
+    return _NEWLINE_RE.sub('\n', _LITERAL_NEWLINE_RE.sub('\n', text))
 
 def keep_letters_whitespace_commas(text: str) -> str:
     """
@@ -26,24 +57,15 @@ def keep_letters_whitespace_commas(text: str) -> str:
     text = normalize_newlines(text)
 
     # Convert non-newline whitespace runs to a single space
-    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = _SPACE_RUN_RE.sub(' ', text)
 
-    kept = []
-    for ch in text:
-        if ch == ',' or ch == '\n' or ch == ' ':
-            kept.append(ch)
-            continue
-        cat = unicodedata.category(ch)
-        # L*: letters; M*: combining marks (accents)
-        if cat[0] in ('L', 'M'):
-            kept.append(ch)
-        # else drop
-
-    text = ''.join(kept)
+    # Keep letters (L*), combining marks (M*), space/newline and commas;
+    # drop everything else in a single C-level translate pass
+    text = text.translate(_KEEP_TABLE)
 
     # Collapse repeated spaces; limit blank lines
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
 
     # Strip trailing spaces on each line and overall
     text = '\n'.join(line.rstrip() for line in text.splitlines())
@@ -52,6 +74,15 @@ def keep_letters_whitespace_commas(text: str) -> str:
 def clean_text(text: str) -> str:
     return keep_letters_whitespace_commas(text)
 
+# Optional compiled fast path: a Cython/mypyc build of the same pipeline
+# as a single forward pass can be dropped in as anonymize/_ctext.so and
+# takes over transparently; the pure-Python version above stays the
+# reference implementation and the fallback.
+try:
+    from ._ctext import clean_text  # noqa: F811
+except ImportError:
+    pass
+
 if __name__ == "__main__":
     sample = "Hello\\nworld!\u2028New line, and emojis 😊, punctuation?!  Non\u00A0breaking\u00A0spaces."
     print(clean_text(sample))
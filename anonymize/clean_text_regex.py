@@ -1,18 +1,26 @@
 import regex as re
 
-def clean_text(text: str) -> str:
-    # Convert literal escapes to real newlines
-    text = text.replace('\\r\\n', '\n').replace('\\n', '\n').replace('\\r', '\n')
-    # Normalize newline variants to \n
-    text = re.sub(r'\r\n?|\u0085|\u2028|\u2029', '\n', text)
+# Literal backslash escapes, collapsed to one newline ("\\r\\n" ordered
+# before the singles so the pair wins). Real newlines must wait for the
+# second pass: a real CR adjacent to a literal escape has to merge with
+# the newline the escape produces, so folding CRLF in here doubled it.
+_LITERAL_NL_RE = re.compile(r'\\r\\n|\\n|\\r')
+
+# Real newline variants: CR/CRLF, NEL, LINE SEP, PARA SEP
+_NEWLINE_RE = re.compile(r'\r\n?|\u0085|\u2028|\u2029')
 
-    # Keep letters (L), combining marks (M), whitespace (\s), and commas
-    text = re.sub(r'[^,\p{L}\p{M}\s]+', '', text)
+# Keep letters (L), combining marks (M), whitespace (\s), and commas
+_KEEP_RE = re.compile(r'[^,\p{L}\p{M}\s]+')
 
-    # Normalize whitespace (keep newlines, collapse other spaces)
-    text = re.sub(r'[^\S\n]+', ' ', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    return text.strip()
+# Non-newline whitespace runs -> one space (already collapses repeats)
+_WS_RE = re.compile(r'[^\S\n]+')
+_NL3_RE = re.compile(r'\n{3,}')
+
+def clean_text(text: str) -> str:
+    text = _LITERAL_NL_RE.sub('\n', text)
+    text = _NEWLINE_RE.sub('\n', text)
+    text = _KEEP_RE.sub('', text)
+    text = _WS_RE.sub(' ', text)
+    return _NL3_RE.sub('\n\n', text).strip()
 
 # pip install regex
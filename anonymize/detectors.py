@@ -1,8 +1,32 @@
+import bisect
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Set
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Dict, Set, Tuple
 
-from . import patterns
+from .patterns import (
+    IBAN_CANDIDATE as _IBAN,
+    CARD_CANDIDATE as _CARD,
+    PESEL_CANDIDATE as _PESEL,
+    NIP_CANDIDATE as _NIP,
+    REGON9_CANDIDATE as _R9,
+    REGON14_CANDIDATE as _R14,
+    IDCARD_CANDIDATE as _IDC,
+    POSTAL_CODE as _POSTAL,
+    UUID_CANDIDATE as _UUID,
+    TRANSACTION_BY_KEYWORD as _TXK,
+    LONG_HEX as _LHEX,
+    ADDRESS_LINE as _ADDR,
+    PHONE_KEYWORD as _PHK,
+    PHONE_GENERAL as _PHG,
+    LONG_NUMBER as _LN,
+    LONG_NUMBER_WS as _LNW,
+    FULL_NAME as _FN,
+    INITIAL_SURNAME as _IS,
+    HONORIFIC_NAME as _HN,
+    HYPHENATED_SURNAME_ONLY as _HSO,
+    NAME_UNION as _NAMEU,
+    MASTER as _MASTER,
+)
 from .checksums import (
     iban_valid,
     luhn_valid,
@@ -12,8 +36,98 @@ from .checksums import (
     polish_id_card_valid,
 )
 
-@dataclass
-class Match:
+# Delete table for alnum normalization: one C-level translate pass
+# instead of a per-character genexp + join
+_DEL_NONALNUM = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(256) if not chr(c).isalnum()))
+
+# Every byte except ASCII '0'-'9', as a bytes.translate delete table
+_B_DEL_NONDIGIT = bytes(c for c in range(256) if not 48 <= c <= 57)
+
+def _digits_of(raw: str) -> bytes:
+    """ASCII digits of a candidate, as bytes.
+
+    The candidate patterns emit (near-)ASCII text, so the encode is
+    cheap and bytes.translate outruns the str table form; the bytes
+    result feeds the length checks and validators directly.
+    """
+    return raw.encode('latin-1', 'ignore').translate(None, _B_DEL_NONDIGIT)
+
+# Memoized validator wrappers: identifiers repeat heavily in logs and
+# exports, and a hit on these short-string keys skips the checksum
+# arithmetic entirely
+_iban_valid = lru_cache(maxsize=4096)(iban_valid)
+_luhn_valid = lru_cache(maxsize=4096)(luhn_valid)
+_pesel_valid = lru_cache(maxsize=4096)(pesel_valid)
+_nip_valid = lru_cache(maxsize=4096)(nip_valid)
+_regon_valid = lru_cache(maxsize=4096)(regon_valid)
+_polish_id_card_valid = lru_cache(maxsize=4096)(polish_id_card_valid)
+
+# Optional Hyperscan prefilter for the fused master scan: one block-mode
+# pass over the UTF-8 buffer answers "can anything here match at all?"
+# before the exact Python regex runs. HS_FLAG_PREFILTER lets Hyperscan
+# over-approximate constructs it cannot match exactly (lookarounds), so a
+# negative answer is always sound; if the pattern set will not compile we
+# simply scan unconditionally.
+_HS_SOURCES = (_IBAN, _CARD, _UUID, _PESEL, _NIP, _R14, _R9, _IDC,
+               _ADDR, _POSTAL, _LHEX, _LN)
+_HS_DB = None
+try:
+    import hyperscan
+except ImportError:
+    pass
+else:
+    try:
+        _db = hyperscan.Database()
+        _db.compile(
+            expressions=[p.pattern.encode('utf-8') for p in _HS_SOURCES],
+            ids=list(range(len(_HS_SOURCES))),
+            flags=[hyperscan.HS_FLAG_PREFILTER
+                   | hyperscan.HS_FLAG_SINGLEMATCH
+                   | hyperscan.HS_FLAG_UTF8
+                   | (p.flags & re.IGNORECASE and hyperscan.HS_FLAG_CASELESS or 0)
+                   for p in _HS_SOURCES],
+        )
+        _HS_DB = _db
+    except Exception:
+        _HS_DB = None
+
+def _master_may_match(text: str) -> bool:
+    """True unless the Hyperscan prefilter proves no master candidate exists."""
+    if _HS_DB is None:
+        return True
+    hit = False
+
+    def on_match(pat_id, start, end, flags, context):
+        nonlocal hit
+        hit = True
+        return 1  # first event is enough; stop the scan
+
+    try:
+        _HS_DB.scan(text.encode('utf-8'), match_event_handler=on_match)
+    except Exception:
+        return True
+    return hit
+
+# Keyword-gated patterns can only match where one of their literal
+# anchors occurs, so a handful of C-level substring scans (str.find via
+# `in`) decide whether the regex needs to run at all. Most documents
+# carry none of these anchors and skip the scans entirely. The anchor
+# lists are minimal: a literal that is a substring of another (e.g. "id"
+# inside "identyfikator") covers it.
+_PHONE_KEYWORD_LITERALS = ("tel", "kom", "mobile", "kontakt")
+_TXK_LITERALS = ("id", "nr", "numer", "transakcj")
+_ADDRESS_LITERALS = ("ul", "al", "pl", "os", "rynek", "rondo",
+                     "bulwar", "skwer", "droga", "deptak")
+
+def _contains_any(text: str, literals: Tuple[str, ...]) -> bool:
+    low = text.lower()
+    return any(lit in low for lit in literals)
+
+class Match(NamedTuple):
+    # NamedTuple keeps thousands of per-document candidates compact (no
+    # per-instance __dict__) and makes .start/.end C-level tuple lookups
+    # in the sort and sweep hot paths
     start: int
     end: int
     value: str
@@ -36,151 +150,320 @@ CategoryPriority: Dict[str, int] = {
     "NAME": 10,
 }
 
-def _add_match(matches: List[Match], start: int, end: int, value: str, category: str):
-    matches.append(Match(start, end, value, category, CategoryPriority.get(category, 0)))
-
 def detect_iban(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.IBAN_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["IBAN"]
+    for m in _IBAN.finditer(text):
         raw = m.group(0)
-        stripped = ''.join(ch for ch in raw if ch.isalnum()).upper()
-        if iban_valid(stripped):
-            _add_match(res, m.start(), m.end(), raw, "IBAN")
+        stripped = raw.translate(_DEL_NONALNUM).upper()
+        if _iban_valid(stripped):
+            append(Match(m.start(), m.end(), raw, "IBAN", priority))
     return res
 
 def detect_card(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.CARD_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["CARD"]
+    for m in _CARD.finditer(text):
         raw = m.group(0)
-        digits = ''.join(ch for ch in raw if ch.isdigit())
-        if 13 <= len(digits) <= 19 and luhn_valid(digits):
-            _add_match(res, m.start(), m.end(), raw, "CARD")
+        if len(raw) < 13:  # digit count can't exceed raw length
+            continue
+        digits = _digits_of(raw)
+        if 13 <= len(digits) <= 19 and _luhn_valid(digits):
+            append(Match(m.start(), m.end(), raw, "CARD", priority))
     return res
 
 def detect_pesel(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.PESEL_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["PESEL"]
+    for m in _PESEL.finditer(text):
         raw = m.group(0)
-        digits = ''.join(ch for ch in raw if ch.isdigit())
-        if len(digits) == 11 and pesel_valid(digits):
-            _add_match(res, m.start(), m.end(), raw, "PESEL")
+        if len(raw) < 11:
+            continue
+        digits = _digits_of(raw)
+        if len(digits) == 11 and _pesel_valid(digits):
+            append(Match(m.start(), m.end(), raw, "PESEL", priority))
     return res
 
 def detect_nip(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.NIP_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["NIP"]
+    for m in _NIP.finditer(text):
         raw = m.group(0)
-        digits = ''.join(ch for ch in raw if ch.isdigit())
-        if len(digits) == 10 and nip_valid(digits):
-            _add_match(res, m.start(), m.end(), raw, "NIP")
+        if len(raw) < 10:
+            continue
+        digits = _digits_of(raw)
+        if len(digits) == 10 and _nip_valid(digits):
+            append(Match(m.start(), m.end(), raw, "NIP", priority))
     return res
 
 def detect_regon(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.REGON14_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["REGON"]
+    for m in _R14.finditer(text):
         raw = m.group(0)
-        if regon_valid(raw):
-            _add_match(res, m.start(), m.end(), raw, "REGON")
-    for m in patterns.REGON9_CANDIDATE.finditer(text):
+        if _regon_valid(raw):
+            append(Match(m.start(), m.end(), raw, "REGON", priority))
+    for m in _R9.finditer(text):
         raw = m.group(0)
-        if regon_valid(raw):
-            _add_match(res, m.start(), m.end(), raw, "REGON")
+        if _regon_valid(raw):
+            append(Match(m.start(), m.end(), raw, "REGON", priority))
     return res
 
 def detect_id_card(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.IDCARD_CANDIDATE.finditer(text):
+    append = res.append
+    priority = CategoryPriority["ID_CARD"]
+    for m in _IDC.finditer(text):
         raw = m.group(0)
-        normalized = ''.join(ch for ch in raw if ch.isalnum()).upper()
-        if polish_id_card_valid(normalized):
-            _add_match(res, m.start(), m.end(), raw, "ID_CARD")
+        normalized = raw.translate(_DEL_NONALNUM).upper()
+        if _polish_id_card_valid(normalized):
+            append(Match(m.start(), m.end(), raw, "ID_CARD", priority))
     return res
 
 def detect_postal_code(text: str) -> List[Match]:
     return [Match(m.start(), m.end(), m.group(0), "POSTAL_CODE", CategoryPriority["POSTAL_CODE"])
-            for m in patterns.POSTAL_CODE.finditer(text)]
+            for m in _POSTAL.finditer(text)]
 
 def detect_uuid(text: str) -> List[Match]:
     return [Match(m.start(), m.end(), m.group(0), "UUID", CategoryPriority["UUID"])
-            for m in patterns.UUID_CANDIDATE.finditer(text)]
+            for m in _UUID.finditer(text)]
+
+def _span_contained(start: int, end: int, spans: List[Tuple[int, int]]) -> bool:
+    """True if [start, end) lies within one of the sorted (start, end) spans."""
+    idx = bisect.bisect_right(spans, (start, end))
+    if idx and spans[idx - 1][0] <= start and end <= spans[idx - 1][1]:
+        return True
+    return idx < len(spans) and spans[idx][0] <= start and end <= spans[idx][1]
 
-def detect_transaction_ids(text: str) -> List[Match]:
+def detect_transaction_ids(
+    text: str,
+    uuid_spans: Optional[List[Tuple[int, int]]] = None,
+) -> List[Match]:
+    """Transaction-id candidates; tokens inside known UUID spans are
+    dropped at the source instead of in the overlap filter."""
     res: List[Match] = []
-    for m in patterns.TRANSACTION_BY_KEYWORD.finditer(text):
-        token = m.group(1)
-        if token:
-            _add_match(res, m.start(1), m.end(1), token, "TRANSACTION_ID")
-    for m in patterns.LONG_HEX.finditer(text):
-        token = m.group(0)
-        res.append(Match(m.start(), m.end(), token, "TRANSACTION_ID", CategoryPriority["TRANSACTION_ID"]))
+    append = res.append
+    priority = CategoryPriority["TRANSACTION_ID"]
+    if _contains_any(text, _TXK_LITERALS):
+        for m in _TXK.finditer(text):
+            token = m.group(1)
+            if token:
+                if uuid_spans and _span_contained(m.start(1), m.end(1), uuid_spans):
+                    continue
+                append(Match(m.start(1), m.end(1), token, "TRANSACTION_ID", priority))
+    for m in _LHEX.finditer(text):
+        if uuid_spans and _span_contained(m.start(), m.end(), uuid_spans):
+            continue
+        append(Match(m.start(), m.end(), m.group(0), "TRANSACTION_ID", priority))
     return res
 
 def detect_addresses(text: str) -> List[Match]:
-    res: List[Match] = []
-    for m in patterns.ADDRESS_LINE.finditer(text):
-        _add_match(res, m.start(), m.end(), m.group(0), "ADDRESS")
-    return res
+    priority = CategoryPriority["ADDRESS"]
+    if not _contains_any(text, _ADDRESS_LITERALS):
+        return []
+    return [Match(m.start(), m.end(), m.group(0), "ADDRESS", priority)
+            for m in _ADDR.finditer(text)]
 
 def detect_phone(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.PHONE_KEYWORD.finditer(text):
-        num_span = m.span("num")
-        raw = m.group("num")
-        digits = ''.join(ch for ch in raw if ch.isdigit())
-        if 9 <= len(digits) <= 11:
-            _add_match(res, num_span[0], num_span[1], raw, "PHONE")
-    for m in patterns.PHONE_GENERAL.finditer(text):
+    append = res.append
+    priority = CategoryPriority["PHONE"]
+    if _contains_any(text, _PHONE_KEYWORD_LITERALS):
+        for m in _PHK.finditer(text):
+            num_span = m.span("num")
+            raw = m.group("num")
+            digits = _digits_of(raw)
+            if 9 <= len(digits) <= 11:
+                append(Match(num_span[0], num_span[1], raw, "PHONE", priority))
+    for m in _PHG.finditer(text):
         raw = m.group("num")
-        digits = ''.join(ch for ch in raw if ch.isdigit())
-        if len(digits) == 9 or (len(digits) == 11 and digits.startswith("48")):
-            _add_match(res, m.start("num"), m.end("num"), raw, "PHONE")
+        digits = _digits_of(raw)
+        if len(digits) == 9 or (len(digits) == 11 and digits.startswith(b"48")):
+            append(Match(m.start("num"), m.end("num"), raw, "PHONE", priority))
     return res
 
 def detect_long_numbers(text: str) -> List[Match]:
     res: List[Match] = []
-    for m in patterns.LONG_NUMBER.finditer(text):
+    append = res.append
+    priority = CategoryPriority["LONG_NUMBER"]
+    for m in _LN.finditer(text):
         raw = m.group(0)
         if len(raw) >= 9:
-            _add_match(res, m.start(), m.end(), raw, "LONG_NUMBER")
-    for m in patterns.LONG_NUMBER_WS.finditer(text):
+            append(Match(m.start(), m.end(), raw, "LONG_NUMBER", priority))
+    for m in _LNW.finditer(text):
         raw = m.group(0)
-        digits = ''.join(ch for ch in raw if ch.isdigit())
+        digits = _digits_of(raw)
         if len(digits) >= 9:
-            _add_match(res, m.start(), m.end(), raw, "LONG_NUMBER")
+            append(Match(m.start(), m.end(), raw, "LONG_NUMBER", priority))
     return res
 
+# ==========================
+# Fused single-pass scanning
+# ==========================
+
+def _check_iban(raw: str) -> bool:
+    return _iban_valid(raw.translate(_DEL_NONALNUM).upper())
+
+def _check_card(raw: str) -> bool:
+    if len(raw) < 13:  # digit count can't exceed raw length
+        return False
+    digits = _digits_of(raw)
+    return 13 <= len(digits) <= 19 and _luhn_valid(digits)
+
+def _check_pesel(raw: str) -> bool:
+    if len(raw) < 11:
+        return False
+    digits = _digits_of(raw)
+    return len(digits) == 11 and _pesel_valid(digits)
+
+def _check_nip(raw: str) -> bool:
+    if len(raw) < 10:
+        return False
+    digits = _digits_of(raw)
+    return len(digits) == 10 and _nip_valid(digits)
+
+def _check_id_card(raw: str) -> bool:
+    return _polish_id_card_valid(raw.translate(_DEL_NONALNUM).upper())
+
+# MASTER group name -> (final category, its priority, validator or None)
+_MASTER_DISPATCH = {
+    name: (category, CategoryPriority[category], check)
+    for name, category, check in [
+        ("IBAN", "IBAN", _check_iban),
+        ("CARD", "CARD", _check_card),
+        ("UUID", "UUID", None),
+        ("PESEL", "PESEL", _check_pesel),
+        ("NIP", "NIP", _check_nip),
+        ("REGON14", "REGON", _regon_valid),
+        ("REGON9", "REGON", _regon_valid),
+        ("IDCARD", "ID_CARD", _check_id_card),
+        ("ADDRESS", "ADDRESS", None),
+        ("POSTAL", "POSTAL_CODE", None),
+        ("LONGHEX", "TRANSACTION_ID", None),
+        ("LONGNUM", "LONG_NUMBER", None),
+    ]
+}
+
+# Detectors used to re-scan the span a failed checksum candidate
+# consumed. A greedy failed IBAN routinely swallows a following postal
+# code, UUID or address line — entities that can even start at the very
+# same position as the failed candidate — so the whole battery runs on
+# the span, not just the hex/digit-run recovery.
+_FAILED_SPAN_BATTERY = (
+    detect_iban, detect_card, detect_pesel, detect_nip, detect_regon,
+    detect_id_card, detect_uuid, detect_postal_code, detect_addresses,
+)
+
+def _scan_master(text: str, matches: List[Match]) -> None:
+    """One fused pass over the text for every group(0)-only detector.
+
+    The independent per-detector passes this replaces generated every
+    overlapping candidate and let the priority-based interval selection
+    pick winners. To keep that semantics the scan must not let any
+    candidate swallow the span it consumed: it always resumes just
+    inside the previous match (pos + 1, as detect_names does), so a
+    higher-priority entity starting within a lower-priority one — a UUID
+    inside a greedy address line, say — is still generated and still
+    wins the selection. Same-start overlaps are safe without rescanning
+    because the alternation is ordered by category priority. A candidate
+    that fails its checksum additionally has its span re-scanned with
+    the full per-detector battery (entities can start at the failed
+    candidate's own position, which pos + 1 skips) plus the hex-token
+    and solid digit-run recovery for TRANSACTION_ID / LONG_NUMBER.
+    Duplicate matches from the overlapping rescans are harmless — the
+    greedy interval selection drops them.
+
+    One faithfulness guard: a per-detector finditer never tests
+    candidate positions inside a span its own pattern already consumed,
+    so a sub-candidate of the *same* group inside a failed span — e.g. a
+    fragment of a failed IBAN whose mod-97 happens to pass — must not be
+    accepted here either, or it outranks the entity (a UUID, say) the
+    independent passes would have redacted. shadow_ends tracks the
+    farthest failed extent per group and suppresses those sub-matches.
+    """
+    append = matches.append
+    tx_priority = CategoryPriority["TRANSACTION_ID"]
+    ln_priority = CategoryPriority["LONG_NUMBER"]
+    search = _MASTER.search
+    shadow_ends: Dict[str, int] = {}
+    pos = 0
+    while True:
+        m = search(text, pos)
+        if m is None:
+            break
+        group = m.lastgroup
+        category, priority, check = _MASTER_DISPATCH[group]
+        raw = m.group()
+        if check is None or check(raw):
+            if m.start() >= shadow_ends.get(group, 0):
+                append(Match(m.start(), m.end(), raw, category, priority))
+            pos = m.start() + 1
+            continue
+        offset = m.start()
+        if m.end() > shadow_ends.get(group, 0):
+            shadow_ends[group] = m.end()
+        for detector in _FAILED_SPAN_BATTERY:
+            for fm in detector(raw):
+                append(Match(offset + fm.start, offset + fm.end,
+                             fm.value, fm.category, fm.priority))
+        for fm in _LHEX.finditer(raw):
+            append(Match(offset + fm.start(), offset + fm.end(),
+                         fm.group(), "TRANSACTION_ID", tx_priority))
+        for fm in _LN.finditer(raw):
+            append(Match(offset + fm.start(), offset + fm.end(),
+                         fm.group(), "LONG_NUMBER", ln_priority))
+        pos = offset + 1
+
 # ======================
 # Name detection helpers
 # ======================
 
-def _surname_variant_candidates(token: str) -> Set[str]:
-    """
-    Generate title/capitalized candidates for a surname token, including common
-    feminine<->masculine Polish suffix alternations:
-      - ska <-> ski, cka <-> cki, dzka <-> dzki
+@lru_cache(maxsize=4)
+def _normalize_name_dicts(first_names: frozenset, surnames: frozenset):
+    return (frozenset(n.capitalize() for n in first_names),
+            frozenset(s.capitalize() for s in surnames))
+
+def prepare_name_dicts(
+    first_names: Optional[Set[str]] = None,
+    surnames: Optional[Set[str]] = None,
+):
+    """Normalize raw name dictionaries to capitalized frozensets, once.
+
+    Dictionaries are typically 10k-100k entries and static across a batch,
+    so batch callers should call this a single time and hand the results to
+    the name detectors; both treat a frozenset argument as already
+    normalized. Repeat calls with the same dictionaries hit an lru_cache.
     """
-    t = token.strip()
-    lower = t.lower()
-    cands: Set[str] = set()
-    # base forms
-    cands.add(t.capitalize())
-    cands.add(t.title())
-    # feminine ↔ masculine alternations
-    suffix_map = {
-        "ska": "ski",
-        "cka": "cki",
-        "dzka": "dzki",
-    }
-    for fem, masc in suffix_map.items():
-        if lower.endswith(fem):
-            root = t[: -len(fem)]
-            cands.add((root + fem).capitalize())
-            cands.add((root + masc).capitalize())
-        if lower.endswith(masc):
-            root = t[: -len(masc)]
-            cands.add((root + masc).capitalize())
-            cands.add((root + fem).capitalize())
-    return cands
+    return _normalize_name_dicts(frozenset(first_names or ()),
+                                 frozenset(surnames or ()))
+
+# Common feminine <-> masculine Polish suffix alternations
+_SURNAME_SUFFIX_ALTERNATES = {
+    "ska": "ski",
+    "cka": "cki",
+    "dzka": "dzki",
+}
+
+@lru_cache(maxsize=4)
+def _surname_lookup(surnames: frozenset) -> frozenset:
+    """Every dictionary surname lowercased plus its feminine/masculine
+    suffix alternate, built once per dictionary, so matching a token is a
+    single membership test instead of generating candidate variants."""
+    lookup: Set[str] = set()
+    for s in surnames:
+        low = s.lower()
+        lookup.add(low)
+        for fem, masc in _SURNAME_SUFFIX_ALTERNATES.items():
+            if low.endswith(fem):
+                lookup.add(low[: -len(fem)] + masc)
+            elif low.endswith(masc):
+                lookup.add(low[: -len(masc)] + fem)
+    return frozenset(lookup)
 
 def _surname_matches_dictionary(surname: str, surnames_dict: Optional[Set[str]]) -> bool:
     """
@@ -190,52 +473,70 @@ def _surname_matches_dictionary(surname: str, surnames_dict: Optional[Set[str]])
     """
     if not surnames_dict:
         return False
-    parts = surname.split("-")
-    for part in parts:
-        for cand in _surname_variant_candidates(part):
-            if cand in surnames_dict:
-                return True
-    # also try the whole joined token just in case dictionary includes hyphenated forms
-    for cand in _surname_variant_candidates(surname):
-        if cand in surnames_dict:
-            return True
-    return False
+    # frozenset(frozenset) is the same object, so the cache key is free for
+    # dictionaries prepared by prepare_name_dicts
+    lookup = _surname_lookup(frozenset(surnames_dict))
+    low = surname.lower()
+    if low in lookup:
+        return True
+    return any(part in lookup for part in low.split("-"))
+
+def _gate_first_name(name: str, fn: frozenset) -> bool:
+    return not fn or name.capitalize() in fn or name.title() in fn
+
+def _gate_surname(surname: str, sn: frozenset) -> bool:
+    return not sn or _surname_matches_dictionary(surname, sn)
 
 def detect_names(
     text: str,
     first_names: Optional[Set[str]] = None,
     surnames: Optional[Set[str]] = None,
 ) -> List[Match]:
+    """One fused pass over the three name shapes (honorific, initial,
+    full pair), dispatched on m.lastgroup, instead of three independent
+    scans of the whole text."""
     res: List[Match] = []
     # Normalize dictionaries to Title/Capitalized for case-insensitive match
-    fn = set(n.capitalize() for n in (first_names or []))
-    sn = set(s.capitalize() for s in (surnames or []))
-
-    # Full name: Firstname + Surname (hyphenated supported)
-    for m in patterns.FULL_NAME.finditer(text):
-        first, last = m.group(1), m.group(2)
-        # Gate by first-name dictionary if provided
-        if fn and first.capitalize() not in fn and first.title() not in fn:
-            continue
-        # Gate by surname dictionary if provided (any hyphen part, with variant mapping)
-        if sn and not _surname_matches_dictionary(last, sn):
-            continue
-        res.append(Match(m.start(), m.end(), m.group(0), "NAME", CategoryPriority["NAME"]))
-
-    # Initial + Surname
-    for m in patterns.INITIAL_SURNAME.finditer(text):
-        last = m.group(2)
-        if sn and not _surname_matches_dictionary(last, sn):
-            continue
-        res.append(Match(m.start(), m.end(), m.group(0), "NAME", CategoryPriority["NAME"]))
+    # (frozensets are trusted to be pre-normalized by prepare_name_dicts)
+    if isinstance(first_names, frozenset) and isinstance(surnames, frozenset):
+        fn, sn = first_names, surnames
+    else:
+        fn, sn = prepare_name_dicts(first_names, surnames)
 
-    # Honorific + Name (firstname only)
-    for m in patterns.HONORIFIC_NAME.finditer(text):
-        name = m.group(2)
-        if fn and name.capitalize() not in fn and name.title() not in fn:
+    append = res.append
+    priority = CategoryPriority["NAME"]
+    search = _NAMEU.search
+    pos = 0
+    while True:
+        m = search(text, pos)
+        if m is None:
+            break
+        kind = m.lastgroup
+        if kind == "hon_name":
+            ok = _gate_first_name(m.group("hon_name"), fn)
+        elif kind == "init_sur":
+            ok = _gate_surname(m.group("init_sur"), sn)
+        else:  # full_sur
+            ok = (_gate_first_name(m.group("full_first"), fn)
+                  and _gate_surname(m.group("full_sur"), sn))
+        if ok:
+            append(Match(m.start(), m.end(), m.group(0), "NAME", priority))
+            pos = m.end()
             continue
-        res.append(Match(m.start(), m.end(), m.group(0), "NAME", CategoryPriority["NAME"]))
-
+        if kind == "hon_name":
+            # An honorific pair that fails the first-name gate can still
+            # parse as Firstname+Surname ("Pan" doubling as a first name),
+            # which the standalone FULL_NAME pass used to catch
+            offset = m.start()
+            for fm in _FN.finditer(m.group(0)):
+                if (_gate_first_name(fm.group(1), fn)
+                        and _gate_surname(fm.group(2), sn)):
+                    append(Match(offset + fm.start(), offset + fm.end(),
+                                 fm.group(0), "NAME", priority))
+        # A rejected candidate must not swallow the rest of the window:
+        # its second token (the lastgroup payload) may begin a real name,
+        # so resume the scan there instead of at m.end()
+        pos = m.start(kind)
     return res
 
 def detect_hyphenated_surname_only(
@@ -249,10 +550,13 @@ def detect_hyphenated_surname_only(
     considering feminine/masculine alternations.
     """
     res: List[Match] = []
-    sn = set(s.capitalize() for s in (surnames or []))
+    if isinstance(surnames, frozenset):
+        sn = surnames
+    else:
+        _, sn = prepare_name_dicts(None, surnames)
     if not sn:
         return res  # require dictionary to keep precision
-    for m in patterns.HYPHENATED_SURNAME_ONLY.finditer(text):
+    for m in _HSO.finditer(text):
         token = m.group(1)
         # Heuristic: ensure it's name-like (each part starts with a letter and looks capitalized or ALL CAPS)
         parts = token.split("-")
@@ -263,37 +567,138 @@ def detect_hyphenated_surname_only(
             res.append(Match(m.start(1), m.end(1), token, "NAME", CategoryPriority["NAME"]))
     return res
 
+def _scan_base(text: str) -> List[Match]:
+    """The name-free detector pipeline, unrolled: fused master scan plus
+    the capture-dependent passes. Shared by both specializations below."""
+    matches: List[Match] = []
+    if _master_may_match(text):
+        _scan_master(text, matches)
+    # Capture-dependent detectors stay as separate passes
+    matches.extend(detect_phone(text))
+    append = matches.append
+    # UUIDs found by the master scan, in text order; keyword tokens that
+    # merely re-find a UUID get dropped here rather than in the sweep
+    uuid_spans = [(m.start, m.end) for m in matches if m.category == "UUID"]
+    priority = CategoryPriority["TRANSACTION_ID"]
+    if _contains_any(text, _TXK_LITERALS):
+        for m in _TXK.finditer(text):
+            token = m.group(1)
+            if token:
+                if uuid_spans and _span_contained(m.start(1), m.end(1), uuid_spans):
+                    continue
+                append(Match(m.start(1), m.end(1), token, "TRANSACTION_ID", priority))
+    priority = CategoryPriority["LONG_NUMBER"]
+    for m in _LNW.finditer(text):
+        raw = m.group(0)
+        if len(_digits_of(raw)) >= 9:
+            append(Match(m.start(), m.end(), raw, "LONG_NUMBER", priority))
+    return matches
+
+def _pipeline_no_names(text, first_names, surnames):
+    return _select_non_overlapping(_scan_base(text))
+
+def _pipeline_with_names(text, first_names, surnames):
+    matches = _scan_base(text)
+    fn, sn = prepare_name_dicts(first_names, surnames)
+    matches.extend(detect_names(text, fn, sn))
+    # Standalone hyphenated surnames (dictionary-gated)
+    matches.extend(detect_hyphenated_surname_only(text, sn))
+    return _select_non_overlapping(matches)
+
 def collect_all_matches(
     text: str,
     first_names: Optional[Set[str]] = None,
     surnames: Optional[Set[str]] = None,
     enable_names: bool = True,
 ) -> List[Match]:
-    matches: List[Match] = []
-    for detector in (
-        detect_iban,
-        detect_card,
-        detect_uuid,
-        detect_pesel,
-        detect_nip,
-        detect_regon,
-        detect_id_card,
-        detect_phone,
-        detect_addresses,
-        detect_postal_code,
-        detect_transaction_ids,
-        detect_long_numbers,
-    ):
-        matches.extend(detector(text))
-    if enable_names:
-        matches.extend(detect_names(text, first_names, surnames))
-        # Standalone hyphenated surnames (dictionary-gated)
-        matches.extend(detect_hyphenated_surname_only(text, surnames))
-    # Greedy non-overlapping selection by (priority desc, length desc)
+    # Dispatch to a flag-free specialization so the common
+    # enable_names=False path carries no dead name-detection work
+    pipeline = _pipeline_with_names if enable_names else _pipeline_no_names
+    return pipeline(text, first_names, surnames)
+
+def _select_non_overlapping(matches: List[Match]) -> List[Match]:
+    # Greedy non-overlapping selection by (priority desc, length desc).
+    # Accepted intervals are kept disjoint and sorted by start, so each
+    # candidate only needs to check its bisect neighbours instead of
+    # scanning all selected matches (O(N log N) vs O(N*M)).
     matches.sort(key=lambda m: (m.priority, (m.end - m.start)), reverse=True)
     selected: List[Match] = []
+    starts: List[int] = []
+    ends: List[int] = []
     for m in matches:
-        if all(m.end <= s.start or m.start >= s.end for s in selected):
-            selected.append(m)
+        idx = bisect.bisect_right(starts, m.start)
+        if idx and ends[idx - 1] > m.start:
+            continue  # overlaps the interval starting at or before us
+        if idx < len(starts) and starts[idx] < m.end:
+            continue  # overlaps the next interval
+        starts.insert(idx, m.start)
+        ends.insert(idx, m.end)
+        selected.append(m)
     selected.sort(key=lambda m: m.start)
     return selected
+
+def _collect_chunk(text: str, offset: int,
+                   first_names: Optional[Set[str]],
+                   surnames: Optional[Set[str]],
+                   enable_names: bool) -> List[Match]:
+    """Worker for collect_all_matches_parallel: scan one chunk and shift
+    the resulting spans back into whole-document coordinates."""
+    return [Match(m.start + offset, m.end + offset, m.value, m.category, m.priority)
+            for m in collect_all_matches(text, first_names, surnames, enable_names)]
+
+def collect_all_matches_parallel(
+    text: str,
+    first_names: Optional[Set[str]] = None,
+    surnames: Optional[Set[str]] = None,
+    enable_names: bool = True,
+    min_chunk: int = 16384,
+    overlap: int = 256,
+) -> List[Match]:
+    """Parallel collect_all_matches for long documents.
+
+    The text is split at newline boundaries into roughly one chunk per
+    core, each chunk extended by ``overlap`` characters (longer than any
+    single match) so spans on a boundary are found by at least one side.
+    Duplicates from the overlap regions are removed by exact
+    (start, end, category) and the greedy interval selection is re-run on
+    the merged set. Texts shorter than two chunks stay sequential — the
+    process pool only pays off on large inputs.
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    if len(text) < 2 * min_chunk:
+        return collect_all_matches(text, first_names, surnames, enable_names)
+
+    workers = os.cpu_count() or 1
+    chunk_size = max(min_chunk, -(-len(text) // workers))
+    bounds = [0]
+    pos = chunk_size
+    while pos < len(text):
+        nl = text.find("\n", pos)
+        if nl == -1:
+            break
+        bounds.append(nl + 1)
+        pos = nl + 1 + chunk_size
+    bounds.append(len(text))
+
+    merged: List[Match] = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(bounds) - 1)) as executor:
+        futures = [
+            executor.submit(
+                _collect_chunk,
+                text[start:min(len(text), bounds[i + 1] + overlap)],
+                start, first_names, surnames, enable_names)
+            for i, start in enumerate(bounds[:-1])
+        ]
+        for future in futures:
+            merged.extend(future.result())
+
+    seen: Set[tuple] = set()
+    unique: List[Match] = []
+    for m in merged:
+        key = (m.start, m.end, m.category)
+        if key not in seen:
+            seen.add(key)
+            unique.append(m)
+    return _select_non_overlapping(unique)
@@ -1,43 +1,89 @@
+import os
 import re
 
+# Optional engine switch for pattern-heavy workloads: setting
+# GUARDRAILS_REGEX_BACKEND=regex compiles every pattern with the
+# third-party `regex` module (API-compatible with re and typically
+# faster on big alternations); =re2 prefers google-re2's linear-time
+# Thompson NFA/DFA, falling back per pattern for the constructs RE2
+# rejects — the digit lookbehinds on CARD/PESEL/REGON and friends stay
+# on the stdlib engine rather than being weakened into post-filters.
+# Anything else, or a missing module, keeps stdlib re throughout.
+# PCRE2 bindings were considered but their match API is not
+# re-compatible with the named-group scanning used here, so they are
+# not offered.
+_BACKEND = os.environ.get("GUARDRAILS_REGEX_BACKEND")
+_re2 = None
+_engine = re
+if _BACKEND == "regex":
+    try:
+        import regex as _engine
+    except ImportError:
+        _engine = re
+elif _BACKEND == "re2":
+    try:
+        import re2 as _re2
+    except ImportError:
+        _re2 = None
+
+def _compile(pattern, flags=0):
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern, flags)
+        except Exception:
+            pass  # lookarounds etc. stay on the stdlib engine
+    return _engine.compile(pattern, flags)
+
+# Letter classes: the stdlib engine gets the enumerated Polish set; the
+# regex backend understands Unicode property classes, which compile to
+# its internal category tables instead of a wide enumerated class, cover
+# letters the enumeration would miss, and remove the risk of the list
+# itself being corrupted by an encoding mishap.
+if _engine is re:
+    _PL_LETTERS = "A-Za-zĄĆĘŁŃÓŚŻŹąćęłńóśżź"
+    _PL_UPPERS = "A-ZĄĆĘŁŃÓŚŻŹ"
+else:
+    _PL_LETTERS = r"\p{L}"
+    _PL_UPPERS = r"\p{Lu}"
+
 # Common Polish letters
-PL_WORD = r"[A-Za-zĄĆĘŁŃÓŚŻŹąćęłńóśżź]"
+PL_WORD = f"[{_PL_LETTERS}]"
 
 # IBAN: capture alnum with optional whitespace/dashes between chars; start with two letters
-IBAN_CANDIDATE = re.compile(r"\b([A-Z]{2}[0-9]{2}(?:[\s-]?[A-Z0-9]){11,})\b", re.IGNORECASE)
+IBAN_CANDIDATE = _compile(r"\b([A-Z]{2}[0-9]{2}(?:[\s-]?[A-Z0-9]){11,})\b", re.IGNORECASE)
 
 # Card numbers 13-19 digits, allow whitespace/dashes; starting digits 2-6 to reduce FP
-CARD_CANDIDATE = re.compile(r"(?<!\d)(?:[2-6]\d(?:[\s-]?\d)){12,18}\b")
+CARD_CANDIDATE = _compile(r"(?<!\d)(?:[2-6]\d(?:[\s-]?\d)){12,18}\b")
 
 # PESEL: 11 digits with optional separators (space or hyphen)
-PESEL_CANDIDATE = re.compile(r"(?<!\d)(?:\d[ -]?){11}(?!\d)")
+PESEL_CANDIDATE = _compile(r"(?<!\d)(?:\d[ -]?){11}(?!\d)")
 
 # NIP: 10 digits, separators allowed
-NIP_CANDIDATE = re.compile(r"\b\d{3}[ -]?\d{3}[ -]?\d{2}[ -]?\d{2}\b")
+NIP_CANDIDATE = _compile(r"\b\d{3}[ -]?\d{3}[ -]?\d{2}[ -]?\d{2}\b")
 
 # REGON: 9 or 14 digits, standalone
-REGON9_CANDIDATE = re.compile(r"(?<!\d)\d{9}(?!\d)")
-REGON14_CANDIDATE = re.compile(r"(?<!\d)\d{14}(?!\d)")
+REGON9_CANDIDATE = _compile(r"(?<!\d)\d{9}(?!\d)")
+REGON14_CANDIDATE = _compile(r"(?<!\d)\d{14}(?!\d)")
 
 # Polish ID card: 3 letters + 6 digits, optional single space after letters
-IDCARD_CANDIDATE = re.compile(r"\b([A-Z]{3})[ ]?(\d{6})\b")
+IDCARD_CANDIDATE = _compile(r"\b([A-Z]{3})[ ]?(\d{6})\b")
 
 # Postal code: NN-NNN
-POSTAL_CODE = re.compile(r"\b\d{2}-\d{3}\b")
+POSTAL_CODE = _compile(r"\b\d{2}-\d{3}\b")
 
 # UUID v1-5
-UUID_CANDIDATE = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}\b")
+UUID_CANDIDATE = _compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[1-5][0-9a-fA-F]{3}-[89abAB][0-9a-fA-F]{3}-[0-9a-fA-F]{12}\b")
 
 # Transaction ID after keywords
-TRANSACTION_BY_KEYWORD = re.compile(
+TRANSACTION_BY_KEYWORD = _compile(
     r"(?i)\b(?:id|identyfikator|transakcj\w*|nr|numer)\s*[:#]?\s*([A-Z0-9]{8,}|\b[0-9a-f]{16,}\b)",
 )
 
 # Long hex tokens (16-64) but standalone
-LONG_HEX = re.compile(r"(?<![0-9a-fA-F])[0-9a-fA-F]{16,64}(?![0-9a-fA-F])")
+LONG_HEX = _compile(r"(?<![0-9a-fA-F])[0-9a-fA-F]{16,64}(?![0-9a-fA-F])")
 
 # Address heuristics (street line) — improved
-ADDRESS_LINE = re.compile(
+ADDRESS_LINE = _compile(
     r"""(?ix)
     \b
     (?:
@@ -45,7 +91,7 @@ ADDRESS_LINE = re.compile(
     )
     \s+
     (                           # street name
-        """ + PL_WORD + r"""[A-Za-zĄĆĘŁŃÓŚŻŹąćęłńóśżź\.\- ]{0,60}?
+        """ + PL_WORD + "[" + _PL_LETTERS + r"""\.\- ]{0,60}?
         (?:\bI{1,3}\b|\bIV\b|\bV\b|\bVI\b|\bVII\b|\bVIII\b|\bIX\b|\bX\b)?   # optional Roman numeral
     )
     \s+
@@ -57,28 +103,28 @@ ADDRESS_LINE = re.compile(
     (?:\s*,\s*
         (\d{2}-\d{3})           # optional postal code
         \s+
-        ([A-ZĄĆĘŁŃÓŚŻŹ][A-Za-zĄĆĘŁŃÓŚŻŹąćęłńóśżź\- ]{1,40})  # optional city
+        ([""" + _PL_UPPERS + "][" + _PL_LETTERS + r"""\- ]{1,40})  # optional city
     )?
     """,
 )
 
 # Full name: Firstname + Surname (supports multi-part hyphenated surnames)
-FULL_NAME = re.compile(
+FULL_NAME = _compile(
     rf"\b({PL_WORD}{{2,}})\s+({PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})*?)\b"
 )
 
 # Initial + Surname: "J. Kowalski" (surname can be hyphenated)
-INITIAL_SURNAME = re.compile(
+INITIAL_SURNAME = _compile(
     rf"\b([A-Z])\.\s*({PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})*)\b"
 )
 
 # Honorific + Name: "Pan Jan", "Pani Anna"
-HONORIFIC_NAME = re.compile(
+HONORIFIC_NAME = _compile(
     rf"(?i)\b(pan|pani)\s+({PL_WORD}{{2,}})\b"
 )
 
 # Phone numbers (Polish)
-PHONE_KEYWORD = re.compile(
+PHONE_KEYWORD = _compile(
     r"""(?ix)
     \b
     (?:tel(?:efon)?|kom\.?|mobile|kontakt(?:\s+tel\.)?)
@@ -97,7 +143,7 @@ PHONE_KEYWORD = re.compile(
     """
 )
 
-PHONE_GENERAL = re.compile(
+PHONE_GENERAL = _compile(
     r"""(?ix)
     (?<!\d)
     (?P<num>
@@ -115,10 +161,51 @@ PHONE_GENERAL = re.compile(
 )
 
 # Generic long numbers (solid)
-LONG_NUMBER = re.compile(r"(?<!\d)\d{9,}(?!\d)")
+LONG_NUMBER = _compile(r"(?<!\d)\d{9,}(?!\d)")
 
 # Generic long numbers split by whitespace: count digits and ensure total >= 9
-LONG_NUMBER_WS = re.compile(r"(?<!\d)(?:\d+\s+){1,}\d+(?!\d)")
+LONG_NUMBER_WS = _compile(r"(?<!\d)(?:\d+\s+){1,}\d+(?!\d)")
 
 # Standalone hyphenated surname token (e.g., "Doe-Świerczewska") — dictionary-gated in detectors
-HYPHENATED_SURNAME_ONLY = re.compile(rf"\b({PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})+)\b")
+HYPHENATED_SURNAME_ONLY = _compile(rf"\b({PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})+)\b")
+
+# The three name shapes fused into one alternation, so name detection
+# walks the text once instead of three times; the detector dispatches on
+# m.lastgroup. Payload groups are named so the dictionary gates read the
+# same tokens the standalone patterns capture. Ordered most-specific
+# first: honorific, then initial, then the generic word pair.
+NAME_UNION = _compile(
+    r"\b(?:"
+    rf"(?i:(?P<hon>pan|pani))\s+(?P<hon_name>{PL_WORD}{{2,}})"
+    rf"|(?P<init>[A-Z])\.\s*(?P<init_sur>{PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})*)"
+    rf"|(?P<full_first>{PL_WORD}{{2,}})\s+(?P<full_sur>{PL_WORD}{{2,}}(?:-{PL_WORD}{{2,}})*?)"
+    r")\b"
+)
+
+def _non_capturing(pattern: str) -> str:
+    """Turn plain capturing groups into non-capturing ones so patterns can
+    be fused into one alternation without shifting group numbers."""
+    return re.sub(r"(?<!\\)\((?!\?)", "(?:", pattern)
+
+# Single-pass master scan: every detector that only needs group(0) fused
+# into one named alternation, ordered by category priority so the
+# highest-priority category wins when several match at the same position.
+# Capture-dependent patterns (phones, keyword transaction ids, names) and
+# the whitespace-glomming LONG_NUMBER_WS stay as separate passes.
+MASTER = _compile("|".join(
+    f"(?P<{name}>{sub})" for name, sub in [
+        ("IBAN", "(?i:" + _non_capturing(IBAN_CANDIDATE.pattern) + ")"),
+        ("CARD", CARD_CANDIDATE.pattern),
+        ("UUID", UUID_CANDIDATE.pattern),
+        ("PESEL", PESEL_CANDIDATE.pattern),
+        ("NIP", NIP_CANDIDATE.pattern),
+        ("REGON14", REGON14_CANDIDATE.pattern),
+        ("REGON9", REGON9_CANDIDATE.pattern),
+        ("IDCARD", _non_capturing(IDCARD_CANDIDATE.pattern)),
+        ("ADDRESS", "(?ix:"
+         + _non_capturing(ADDRESS_LINE.pattern.replace("(?ix)", "", 1))
+         + ")"),
+        ("POSTAL", POSTAL_CODE.pattern),
+        ("LONGHEX", LONG_HEX.pattern),
+        ("LONGNUM", LONG_NUMBER.pattern),
+    ]))
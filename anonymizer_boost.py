@@ -1,47 +1,164 @@
 import os, re, hashlib
-from typing import List, Dict
-from dataclasses import dataclass
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Dict, NamedTuple
 import spacy
 from config import AnonymizationConfig
 
 nlp = spacy.load("en_core_web_trf")
+try:
+    # Only the transformer and NER are consumed below; tagger/parser/
+    # lemmatizer inference is pure overhead for this pipeline
+    nlp.select_pipes(enable=["transformer", "ner"])
+except Exception:
+    pass
+
+# Optional linear-time engines, selected via GUARDRAILS_REGEX_BACKEND:
+# "re2" prefers google-re2's Thompson NFA/DFA (one pass, no catastrophic
+# backtracking), "regex" the third-party regex module. Patterns an engine
+# rejects (RE2 has no lookaround, used by SSN/ALPHANUM_ID) fall back per
+# pattern, so the battery always compiles.
+_BACKEND = os.environ.get("GUARDRAILS_REGEX_BACKEND", "re")
+_re2 = _regex = None
+if _BACKEND == "re2":
+    try:
+        import re2 as _re2
+    except ImportError:
+        _re2 = None
+elif _BACKEND == "regex":
+    try:
+        import regex as _regex
+    except ImportError:
+        _regex = None
+
+def _compile(pattern: str, flags: int = 0):
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern, flags)
+        except Exception:
+            pass  # lookarounds etc. stay on the stdlib engine
+    if _regex is not None:
+        return _regex.compile(pattern, flags)
+    return re.compile(pattern, flags)
 
 BASE_PATTERNS = {
-    "EMAIL": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
-    "PHONE": re.compile(r"""(?x)(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4}"""),
-    "CREDIT_CARD": re.compile(r"\b(?:\d[ -]*?){13,19}\b"),
-    "SSN": re.compile(r"\b(?!000|666|9\d\d)\d{3}[- ]?(?!00)\d{2}[- ]?(?!0000)\d{4}\b"),
-    "IPV4": re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b"),
-    "ADDRESS_FRAGMENT": re.compile(
+    "EMAIL": _compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+    "PHONE": _compile(r"""(?x)(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4}"""),
+    "CREDIT_CARD": _compile(r"\b(?:\d[ -]*?){13,19}\b"),
+    "SSN": _compile(r"\b(?!000|666|9\d\d)\d{3}[- ]?(?!00)\d{2}[- ]?(?!0000)\d{4}\b"),
+    "IPV4": _compile(r"\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b"),
+    "ADDRESS_FRAGMENT": _compile(
         r"\b\d{1,6}\s+(?:[A-Za-z0-9'\.-]+\s){0,5}(Street|St|Road|Rd|Avenue|Ave|Boulevard|Blvd|Lane|Ln|Court|Ct|Drive|Dr)\b",
         re.IGNORECASE
     )
 }
 
-GENERIC_NUMERIC_FORMATTED = re.compile(r"\b\d[\d\-./_,]*\d\b")
-GENERIC_INTEGER = re.compile(r"\b\d+\b")
-DECIMAL_NUMBER = re.compile(r"\b\d+\.\d+\b")
-ALPHANUM_ID = re.compile(r"\b(?=[A-Za-z0-9]*[A-Za-z])(?=[A-Za-z0-9]*\d)[A-Za-z0-9]{6,}\b")
-GUID_PATTERN = re.compile(r"\b[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}\b")
-HEX_LONG = re.compile(r"\b[0-9a-fA-F]{16,}\b")
+GENERIC_NUMERIC_FORMATTED = _compile(r"\b\d[\d\-./_,]*\d\b")
+GENERIC_INTEGER = _compile(r"\b\d+\b")
+DECIMAL_NUMBER = _compile(r"\b\d+\.\d+\b")
+ALPHANUM_ID = _compile(r"\b(?=[A-Za-z0-9]*[A-Za-z])(?=[A-Za-z0-9]*\d)[A-Za-z0-9]{6,}\b")
+GUID_PATTERN = _compile(r"\b[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}\b")
+HEX_LONG = _compile(r"\b[0-9a-fA-F]{16,}\b")
+
+# The battery is scanned per pattern, in priority order, and the
+# candidates go through merge_spans' priority-based overlap resolution.
+# An earlier revision fused the whole battery into one alternation, but
+# that made the scan leftmost-first *across* categories: an early match
+# of the unanchored PHONE alternative could swallow the opening digits
+# of a credit card starting a little later, so the card candidate was
+# never generated and its raw digits leaked around a [PHONE] token.
+# Every pattern here can overlap another through shared digit runs, so
+# nothing is safe to fuse; independent per-category streams keep every
+# candidate intact and leave the overlap decision to priority, not text
+# position.
+_BATTERY_ORDER = ("CREDIT_CARD", "SSN", "EMAIL", "PHONE", "IPV4", "ADDRESS_FRAGMENT")
+
+# Optional Hyperscan prefilter over the same battery: one SIMD block-mode
+# pass reports which patterns can possibly match before the exact scans
+# run, so categories it rules out skip their finditer pass entirely.
+# HS_FLAG_PREFILTER over-approximates the lookarounds Hyperscan cannot
+# match exactly, so a negative answer is sound; if the set will not
+# compile we scan everything unconditionally.
+_HS_DB = None
+try:
+    import hyperscan
+except ImportError:
+    pass
+else:
+    try:
+        _db = hyperscan.Database()
+        _db.compile(
+            expressions=[BASE_PATTERNS[label].pattern.encode() for label in _BATTERY_ORDER],
+            ids=list(range(len(_BATTERY_ORDER))),
+            flags=[hyperscan.HS_FLAG_PREFILTER
+                   | hyperscan.HS_FLAG_SINGLEMATCH
+                   | hyperscan.HS_FLAG_UTF8
+                   | (hyperscan.HS_FLAG_CASELESS if label == "ADDRESS_FRAGMENT" else 0)
+                   for label in _BATTERY_ORDER],
+        )
+        _HS_DB = _db
+    except Exception:
+        _HS_DB = None
+
+def _base_may_match(text: str):
+    """Labels whose patterns may match the text, or None for "scan all"."""
+    if _HS_DB is None:
+        return None
+    hits = set()
+    n_patterns = len(_BATTERY_ORDER)
+
+    def on_match(pat_id, start, end, flags, context):
+        hits.add(pat_id)
+        # Every pattern has fired at least once; nothing left to learn
+        return 1 if len(hits) == n_patterns else 0
+
+    try:
+        _HS_DB.scan(text.encode(), match_event_handler=on_match)
+    except Exception:
+        return None
+    return frozenset(_BATTERY_ORDER[i] for i in hits)
+
+# Non-digit stripping and shape extraction as single C-level translate
+# passes; re.sub(r"\D", ...) pays regex-engine overhead on every candidate
+_DIGITS_ONLY_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(256) if not chr(c).isdigit()))
+_SHAPE_TABLE = str.maketrans('0123456789', 'DDDDDDDDDD')
+
+def _digits_only(s: str) -> str:
+    return s.translate(_DIGITS_ONLY_TABLE)
+
+# Branchless Luhn: doubled-digit lookup indexed by digit value, and an
+# ASCII '0'-'9' -> value table so the checksum is two C-level sums over
+# byte slices with no per-digit branches or int() parsing
+_LUHN_DOUBLE = bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9])
+_DIGIT_VALUES = bytes(b - 48 if 48 <= b <= 57 else 0 for b in range(256))
 
 def luhn_valid(number: str) -> bool:
-    digits = [int(d) for d in re.sub(r"\D", "", number)]
-    if len(digits) < 13: return False
-    checksum = 0
-    parity = len(digits) % 2
-    for i, d in enumerate(digits):
-        if i % 2 == parity:
-            d = d * 2
-            if d > 9: d -= 9
-        checksum += d
-    return checksum % 10 == 0
+    vals = _digits_only(number).encode().translate(_DIGIT_VALUES)
+    if len(vals) < 13:
+        return False
+    total = sum(map(_LUHN_DOUBLE.__getitem__, vals[-2::-2])) + sum(vals[-1::-2])
+    return total % 10 == 0
+
+@lru_cache(maxsize=8)
+def _salted_sha(salt: str):
+    # Prototype hash with the salt already absorbed; each call just
+    # copies the compression state instead of re-hashing the salt and
+    # paying a salt+value string concat per entity
+    return hashlib.sha256(salt.encode())
 
 def stable_hash(value: str, salt: str) -> str:
-    return hashlib.sha256((salt + value).encode()).hexdigest()[:16]
+    h = _salted_sha(salt).copy()
+    h.update(value.encode())
+    # digest()[:8].hex() equals hexdigest()[:16] without building the
+    # full 64-char hex string first
+    return h.digest()[:8].hex()
 
-@dataclass
-class EntitySpan:
+class EntitySpan(NamedTuple):
+    # NamedTuple keeps the thousands of spans a long document produces
+    # compact (no per-instance __dict__ or GC header) and makes the
+    # field reads in the merge sweep C-level tuple lookups; immutability
+    # also lets the detect_base/detect_ner caches share results safely
     start: int
     end: int
     label: str
@@ -63,99 +180,238 @@ PRIORITY = {
     "LOC": 50
 }
 
-def detect_base(text: str) -> List[EntitySpan]:
+def _detect_base_serial(text: str) -> List[EntitySpan]:
     spans = []
-    for label, pattern in BASE_PATTERNS.items():
-        for m in pattern.finditer(text):
+    append = spans.append
+    may_match = _base_may_match(text)
+    if may_match is not None and not may_match:
+        return spans
+    for label in _BATTERY_ORDER:
+        if may_match is not None and label not in may_match:
+            continue
+        mapped = "ADDRESS" if label == "ADDRESS_FRAGMENT" else label
+        priority = PRIORITY.get(mapped, 10)
+        for m in BASE_PATTERNS[label].finditer(text):
             raw = m.group(0)
             if label == "CREDIT_CARD" and not luhn_valid(raw):
+                # A failed Luhn candidate carries no entity of its own;
+                # any SSN or phone inside the digit run is still found
+                # by those patterns' independent passes
                 continue
-            mapped = "ADDRESS" if label == "ADDRESS_FRAGMENT" else label
-            spans.append(EntitySpan(m.start(), m.end(), mapped, raw, PRIORITY.get(mapped, 10)))
+            append(EntitySpan(m.start(), m.end(), mapped, raw, priority))
     return spans
 
-def detect_ner(text: str) -> List[EntitySpan]:
-    doc = nlp(text)
+# Chunked scanning kicks in above this size: 64KB core chunks padded
+# with 2KB of context on both sides, far longer than any base pattern
+# can match. Each chunk owns only the matches that *start* inside its
+# core; the padding guarantees those matches are scanned with their
+# full surroundings, so nothing is truncated at a boundary and no span
+# is reported twice. Threads only buy wall-clock time when the compiled
+# engine (re2/hyperscan) releases the GIL during the scan; under stock
+# re the chunked path is still correct and simply serializes.
+_PARALLEL_THRESHOLD = 65536
+_CHUNK_SIZE = 65536
+_CHUNK_OVERLAP = 2048
+
+def detect_base(text: str) -> List[EntitySpan]:
+    if len(text) <= _PARALLEL_THRESHOLD:
+        return _detect_base_serial(text)
+    from concurrent.futures import ThreadPoolExecutor
+    offsets = range(0, len(text), _CHUNK_SIZE)
+    regions = [text[max(0, off - _CHUNK_OVERLAP):off + _CHUNK_SIZE + _CHUNK_OVERLAP]
+               for off in offsets]
+    spans = []
+    append = spans.append
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for off, region_spans in zip(offsets, pool.map(_detect_base_serial, regions)):
+            base = off - min(off, _CHUNK_OVERLAP)
+            core_end = off + _CHUNK_SIZE
+            for s in region_spans:
+                start = base + s.start
+                if start < off or start >= core_end:
+                    continue  # the padding belongs to a neighbouring chunk
+                append(EntitySpan(start, base + s.end, s.label, s.text, s.priority))
+    return spans
+
+def _ner_spans_from_doc(doc) -> List[EntitySpan]:
     out = []
     for ent in doc.ents:
         if ent.label_ in ("PERSON","ORG","GPE","LOC"):
             out.append(EntitySpan(ent.start_char, ent.end_char, ent.label_, ent.text, PRIORITY.get(ent.label_, 10)))
     return out
 
+@lru_cache(maxsize=512)
+def _detect_ner_cached(text: str) -> tuple:
+    # Tuple result so the cached value cannot be mutated by callers
+    return tuple(_ner_spans_from_doc(nlp(text)))
+
+# Documents above this size (in characters — the caches key on str
+# objects, so character count is what pins memory) bypass both the
+# detect_base and detect_ner caches, so a stream of huge inputs cannot
+# pin hundreds of full texts in memory; repeated-input savings matter
+# most for small templated documents anyway
+MAX_CACHED_TEXT_CHARS = 1 << 20
+
+@lru_cache(maxsize=1024)
+def _detect_base_cached(text: str) -> tuple:
+    # Keyed on the text itself: lru_cache hashes the string once and str
+    # objects memoize their hash, so a separate blake2b digest key would
+    # only add work. Tuple result so the cached spans cannot be mutated.
+    return tuple(detect_base(text))
+
+def detect_ner(text: str) -> List[EntitySpan]:
+    if len(text) <= MAX_CACHED_TEXT_CHARS:
+        return list(_detect_ner_cached(text))
+    return _ner_spans_from_doc(nlp(text))
+
+def detect_ner_batch(texts: List[str]) -> List[List[EntitySpan]]:
+    # Batched transformer inference amortizes tokenization and device
+    # launch overhead that a per-document nlp(text) call pays every time
+    return [_ner_spans_from_doc(doc) for doc in nlp.pipe(texts, batch_size=32)]
+
 def span_overlap(a: EntitySpan, b: EntitySpan) -> bool:
     return not (a.end <= b.start or a.start >= b.end)
 
 def merge_spans(spans: List[EntitySpan]) -> List[EntitySpan]:
+    # Accepted spans are always pairwise disjoint (every insertion evicts
+    # whatever it overlaps), so they stay sorted by both start and end and
+    # the spans overlapping a candidate form one contiguous slice found by
+    # bisecting the parallel end-offset list. Walking candidates in
+    # (start, -priority) order and splicing that slice makes the whole
+    # merge O(N log N) instead of the old scan-every-survivor-and-
+    # list.remove loop, which went quadratic once the detectors emitted
+    # thousands of spans on a long document.
     spans_sorted = sorted(spans, key=lambda s: (s.start, -s.priority))
     result = []
+    ends = []
     for s in spans_sorted:
-        replaced = False
-        to_remove = []
-        for r in result:
-            if span_overlap(s, r):
-                if s.priority > r.priority:
-                    to_remove.append(r)
-                else:
-                    replaced = True
-                    break
-        if replaced:
+        lo = bisect_right(ends, s.start)
+        hi = lo
+        blocked = False
+        while hi < len(result) and result[hi].start < s.end:
+            if result[hi].priority >= s.priority:
+                blocked = True
+                break
+            hi += 1
+        if blocked:
             continue
-        for r in to_remove:
-            result.remove(r)
-        result.append(s)
-    return sorted(result, key=lambda s: s.start)
+        result[lo:hi] = [s]
+        ends[lo:hi] = [s.end]
+    return result
 
 def extract_shape(num_str: str) -> str:
-    return re.sub(r"\d", "D", num_str)
+    return num_str.translate(_SHAPE_TABLE)
 
 def normalize_number(num_str: str, strategy: str) -> str:
     if strategy == "digits_only":
-        return re.sub(r"\D", "", num_str)
+        return _digits_only(num_str)
     if strategy == "canonical":
-        digits_only = re.sub(r"\D", "", num_str)
+        digits_only = _digits_only(num_str)
         shape = extract_shape(num_str)
         return f"{digits_only}|{shape}"
     return num_str
 
-def detect_generic_numbers(text: str, existing: List[EntitySpan], cfg: AnonymizationConfig) -> List[EntitySpan]:
+# Digits pass through, every other byte becomes a space: after one
+# C-level translate, maximal digit runs are exactly the split() parts
+# and their offsets fall out of the running position
+_NON_DIGITS_TO_SPACE = bytes(b if 48 <= b <= 57 else 32 for b in range(256))
+
+def _digit_runs(text: str, min_len: int) -> List[tuple]:
+    """(start, end) offsets of maximal digit runs of at least min_len.
+
+    Only valid for ASCII text, where byte and character offsets agree;
+    callers fall back to the regex for anything else.
+    """
+    marked = text.encode().translate(_NON_DIGITS_TO_SPACE)
+    out = []
+    pos = 0
+    for part in marked.split(b" "):
+        ln = len(part)
+        if ln >= min_len:
+            out.append((pos, pos + ln))
+        pos += ln + 1
+    return out
+
+class IntervalIndex:
+    """Sorted disjoint occupied intervals, shared across detector passes.
+
+    The spans fed in come from merge_spans, so they are disjoint and the
+    overlap test is a single bisect on the end array plus one
+    comparison. Accepted spans from later passes are inserted in place,
+    letting one index serve the whole anonymize pipeline instead of each
+    detector rebuilding its own.
+    """
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, spans=()):
+        intervals = sorted((s.start, s.end) for s in spans)
+        self._starts = [a for a, _ in intervals]
+        self._ends = [b for _, b in intervals]
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect_right(self._ends, start)
+        return i < len(self._starts) and self._starts[i] < end
+
+    def add(self, start: int, end: int) -> None:
+        i = bisect_right(self._ends, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+
+def detect_generic_numbers(text: str, existing, cfg: AnonymizationConfig) -> List[EntitySpan]:
     if not cfg.aggressive_numeric_redaction:
         return []
-    occupied = [(s.start, s.end) for s in existing]
-
-    def overlaps_any(start: int, end: int) -> bool:
-        for a, b in occupied:
-            if not (end <= a or start >= b):
-                return True
-        return False
+    occupied = existing if isinstance(existing, IntervalIndex) else IntervalIndex(existing)
+    overlaps_any = occupied.overlaps
 
     spans = []
-    patterns = [DECIMAL_NUMBER, GENERIC_NUMERIC_FORMATTED, GENERIC_INTEGER]
+    append = spans.append
+    min_len = cfg.min_numeric_length
+    priority = PRIORITY["GENERIC_NUMBER"]
+    patterns = [DECIMAL_NUMBER, GENERIC_NUMERIC_FORMATTED]
     for pat in patterns:
         for m in pat.finditer(text):
             s, e = m.start(), m.end()
             if overlaps_any(s, e):
                 continue
             token = m.group(0)
-            digits_only = re.sub(r"\D", "", token)
-            if cfg.preserve_small_integers and digits_only.isdigit():
-                val_int = int(digits_only) if digits_only else None
-                if val_int is not None and val_int <= cfg.small_integer_max and len(digits_only) < cfg.min_numeric_length:
-                    continue
-            if len(digits_only) < cfg.min_numeric_length:
+            # Digit count decides everything: the old small-integer branch
+            # could only skip a token when its digit count was already
+            # below min_numeric_length, which the gate below skips
+            # unconditionally, so the per-candidate isdigit()/int()
+            # parsing was dead work. The count itself is one C-level
+            # translate; tokens shorter than the threshold cannot have
+            # enough digits and skip even that.
+            if e - s < min_len or len(_digits_only(token)) < min_len:
+                continue
+            append(EntitySpan(s, e, "GENERIC_NUMBER", token, priority))
+    # The plain-integer pass is a one-character classifier, so on ASCII
+    # text the digit runs come from a translate+split scan with the \b
+    # ends re-checked against letter/underscore neighbours — no regex
+    # engine involved. Non-ASCII text keeps the regex, whose \b knows
+    # about Unicode word characters.
+    text_len = len(text)
+    if text.isascii():
+        for s, e in _digit_runs(text, min_len):
+            before = text[s - 1] if s else " "
+            after = text[e] if e < text_len else " "
+            if before.isalpha() or before == "_" or after.isalpha() or after == "_":
+                continue
+            if overlaps_any(s, e):
+                continue
+            append(EntitySpan(s, e, "GENERIC_NUMBER", text[s:e], priority))
+    else:
+        for m in GENERIC_INTEGER.finditer(text):
+            s, e = m.start(), m.end()
+            if e - s < min_len or overlaps_any(s, e):
                 continue
-            spans.append(EntitySpan(s, e, "GENERIC_NUMBER", token, PRIORITY["GENERIC_NUMBER"]))
+            append(EntitySpan(s, e, "GENERIC_NUMBER", m.group(0), priority))
     return spans
 
-def detect_alphanum_ids(text: str, existing: List[EntitySpan], cfg: AnonymizationConfig) -> List[EntitySpan]:
+def detect_alphanum_ids(text: str, existing, cfg: AnonymizationConfig) -> List[EntitySpan]:
     if not cfg.general_alphanumeric_id_redaction:
         return []
-    occupied = [(s.start, s.end) for s in existing]
-
-    def overlaps_any(start: int, end: int) -> bool:
-        for a, b in occupied:
-            if not (end <= a or start >= b):
-                return True
-        return False
+    occupied = existing if isinstance(existing, IntervalIndex) else IntervalIndex(existing)
+    overlaps_any = occupied.overlaps
 
     spans = []
     for pattern in (GUID_PATTERN, HEX_LONG, ALPHANUM_ID):
@@ -179,7 +435,7 @@ def transform(entity: EntitySpan, salt: str, counters: Dict, cfg: AnonymizationC
     if entity.label == "PHONE":
         return "[PHONE]"
     if entity.label == "CREDIT_CARD":
-        digits = re.sub(r"\D", "", entity.text)
+        digits = _digits_only(entity.text)
         if cfg.retain_credit_card_last4 and len(digits) >= 4:
             last4 = digits[-4:]
             return f"[CARD_{stable_hash(digits, salt)}_LAST4_{last4}]"
@@ -193,14 +449,21 @@ def transform(entity: EntitySpan, salt: str, counters: Dict, cfg: AnonymizationC
     if entity.label == "IPV4":
         return "[IP]"
     if entity.label == "GENERIC_NUMBER":
-        norm = normalize_number(entity.text, cfg.normalization_strategy)
+        # Inlined normalize_number so digits_only and the shape are each
+        # computed at most once per span instead of once per use
+        digits_only = _digits_only(entity.text)
+        strategy = cfg.normalization_strategy
+        if strategy == "digits_only":
+            norm = digits_only
+        elif strategy == "canonical":
+            norm = f"{digits_only}|{extract_shape(entity.text)}"
+        else:
+            norm = entity.text
         h = stable_hash(norm, salt)
-        digits_only = re.sub(r"\D", "", entity.text)
-        length_digits = len(digits_only)
-        if cfg.include_shape_metadata and cfg.normalization_strategy != "canonical":
+        if cfg.include_shape_metadata and strategy != "canonical":
             shape = extract_shape(entity.text)
             # All variables precomputed; no backslashes in f-string expression parts
-            return f"[NUM_{h}_S={shape}_L={length_digits}]"
+            return f"[NUM_{h}_S={shape}_L={len(digits_only)}]"
         return f"[NUM_{h}]"
     if entity.label == "ALPHANUM_ID":
         norm = entity.text.upper()
@@ -208,37 +471,65 @@ def transform(entity: EntitySpan, salt: str, counters: Dict, cfg: AnonymizationC
         return f"[ID_{h}_L={len(entity.text)}]"
     return "[REDACTED]"
 
-def anonymize(text: str, cfg: AnonymizationConfig) -> dict:
+def _anonymize_with_ner(text: str, ner_spans: List[EntitySpan], cfg: AnonymizationConfig) -> dict:
     salt = os.environ.get(cfg.salt_env_var, "change_me")
-    base_spans = detect_base(text)
-    ner_spans = detect_ner(text)
+    if len(text) <= MAX_CACHED_TEXT_CHARS:
+        base_spans = list(_detect_base_cached(text))
+    else:
+        base_spans = detect_base(text)
     merged = merge_spans(base_spans + ner_spans)
-    gen_num_spans = detect_generic_numbers(text, merged, cfg)
-    merged = merge_spans(merged + gen_num_spans)
-    alphanum_spans = detect_alphanum_ids(text, merged, cfg)
-    merged = merge_spans(merged + alphanum_spans)
+    # One occupied-interval index serves both follow-up passes: each
+    # pass's accepted spans only ever conflict among themselves (the
+    # detectors already reject anything overlapping the index), so
+    # merge_spans runs on the small per-pass lists and the survivors are
+    # inserted into the index instead of re-merging the full span set
+    occupied = IntervalIndex(merged)
+    gen_num_spans = merge_spans(detect_generic_numbers(text, occupied, cfg))
+    for s in gen_num_spans:
+        occupied.add(s.start, s.end)
+    alphanum_spans = merge_spans(detect_alphanum_ids(text, occupied, cfg))
+    merged = sorted(merged + gen_num_spans + alphanum_spans, key=lambda s: s.start)
     counters = {}
-    output = []
+    # Pull the span fields out into parallel tuples once, then build the
+    # output as a preallocated parts list closed by a single join: the
+    # interleave loop does no list growth and no attribute lookups, and
+    # the metadata falls out of a zip comprehension over the same arrays
+    starts = tuple(s.start for s in merged)
+    ends = tuple(s.end for s in merged)
+    labels = tuple(s.label for s in merged)
+    texts = tuple(s.text for s in merged)
+    replacements = [transform(span, salt, counters, cfg) for span in merged]
+    parts = [""] * (2 * len(merged) + 1)
     last = 0
-    entities_meta = []
-    for span in merged:
-        output.append(text[last:span.start])
-        replacement = transform(span, salt, counters, cfg)
-        output.append(replacement)
-        entities_meta.append({
-            "label": span.label,
-            "original": span.text,
+    for i, (s, e) in enumerate(zip(starts, ends)):
+        parts[2 * i] = text[last:s]
+        parts[2 * i + 1] = replacements[i]
+        last = e
+    parts[-1] = text[last:]
+    entities_meta = [
+        {
+            "label": label,
+            "original": original,
             "replacement": replacement,
-            "start": span.start,
-            "end": span.end
-        })
-        last = span.end
-    output.append(text[last:])
+            "start": s,
+            "end": e,
+        }
+        for label, original, replacement, s, e
+        in zip(labels, texts, replacements, starts, ends)
+    ]
     return {
-        "sanitized_text": "".join(output),
+        "sanitized_text": "".join(parts),
         "entities": entities_meta
     }
 
+def anonymize(text: str, cfg: AnonymizationConfig) -> dict:
+    return _anonymize_with_ner(text, detect_ner(text), cfg)
+
+def anonymize_batch(texts: List[str], cfg: AnonymizationConfig) -> List[dict]:
+    ner_batches = detect_ner_batch(texts)
+    return [_anonymize_with_ner(text, ner_spans, cfg)
+            for text, ner_spans in zip(texts, ner_batches)]
+
 if __name__ == "__main__":
     from config import AnonymizationConfig
     cfg = AnonymizationConfig()
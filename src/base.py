@@ -12,7 +12,13 @@ class BaseGuardrail(ABC):
     """
     Base class for all guardrail implementations.
     """
-    
+
+    # Whether preprocess may return a modified prompt rather than just
+    # passing it through or blocking. Pure-check guardrails override
+    # this with False, which lets the client run them concurrently;
+    # the conservative default keeps unknown subclasses sequential.
+    transforms_prompt = True
+
     def __init__(self):
         """Initialize the base guardrail."""
         self.safety_message = "I cannot fulfill this request due to safety concerns."
@@ -4,36 +4,76 @@
 Content filtering guardrail to detect and block harmful outputs.
 """
 
+import hashlib
 import json
 import logging
+import re
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 
 from .base import BaseGuardrail
 
+# Optional fast JSON parser; stdlib json stays as the fallback and as
+# the raw_decode path for responses with trailing prose
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Shared decoder for raw_decode-based JSON extraction from model output
+_JSON_DECODER = json.JSONDecoder()
+
+# Vocabulary for the optional local prefilter: content matching none of
+# these markers is scored 0.0 without an evaluation call. Deliberately
+# broad — the prefilter only has to be cheap and high-recall, anything
+# it flags still goes to the model for a real score.
+_RISK_MARKER_PATTERN = re.compile(
+    r"weapon|bomb|explos|gun|kill|murder|suicide|self[- ]?harm|attack"
+    r"|hack|exploit|malware|virus|ransom|phish|password|credential"
+    r"|drug|narcotic|poison|steal|launder|fraud|forg(?:e|ery)|illegal"
+    r"|violen|abuse|assault|torture|credit\s*card|ssn|social\s*security",
+    re.IGNORECASE,
+)
+
 
 class ContentFilterGuardrail(BaseGuardrail):
     """
     Guardrail that evaluates content for harmful, unsafe, or prohibited content.
     """
-    
-    def __init__(self, client=None, risk_threshold: float = 0.7, categories: List[str] = None):
+
+    # preprocess only scores the prompt; it never rewrites it
+    transforms_prompt = False
+
+
+    def __init__(self, client=None, risk_threshold: float = 0.7, categories: List[str] = None,
+                 local_prefilter: bool = False):
         """
         Initialize the content filter guardrail.
-        
+
         Args:
             client: Gemini client for content evaluation
             risk_threshold (float): Risk score threshold (0.0-1.0) above which content is blocked
             categories (List[str], optional): Categories of content to evaluate.
                 Defaults to ["harmful", "illegal", "unethical", "sensitive"].
+            local_prefilter (bool): Dismiss content matching no local risk
+                marker with score 0.0, skipping the evaluation call.
+                Trades a little recall for a large latency/cost win, so
+                it is opt-in.
         """
         super().__init__()
         self.client = client
         self.risk_threshold = risk_threshold
         self.categories = categories or ["harmful", "illegal", "unethical", "sensitive"]
+        self.local_prefilter = local_prefilter
         self.safety_message = "I cannot fulfill this request as it may result in content that violates safety guidelines."
-        
+        # Memoizes check_safety on a content digest. Streaming re-scores
+        # the same buffer repeatedly; a hit here skips an entire LLM
+        # round-trip, which dominates the cost of the check.
+        self._safety_cache = OrderedDict()
+        self._safety_cache_size = 256
+
     def preprocess(self, prompt: str, **kwargs) -> Optional[str]:
         """
         Check if the input prompt is requesting harmful content.
@@ -82,13 +122,48 @@ class ContentFilterGuardrail(BaseGuardrail):
     def check_safety(self, content: str) -> float:
         """
         Check content safety using the model itself.
-        
+
+        Results are cached per content digest (LRU, bounded), so
+        re-evaluating an identical buffer — common when streaming with
+        the circuit breaker — returns immediately instead of making
+        another evaluation call.
+
         Args:
             content (str): Content to evaluate
-            
+
         Returns:
             float: Risk score between 0.0 (safe) and 1.0 (unsafe)
         """
+        # Key on (digest, length): the 128-bit blake2b digest alone is
+        # already collision-safe, the length just makes the key cheap to
+        # reason about.
+        key = (hashlib.blake2b(content.encode(), digest_size=16).digest(), len(content))
+        cached = self._safety_cache.get(key)
+        if cached is not None:
+            self._safety_cache.move_to_end(key)
+            return cached
+        score, from_model = self._check_safety_uncached(content)
+        # Error-path defaults are deliberately not cached: a transient
+        # evaluation outage would otherwise pin its fail-open 0.0 (or the
+        # parse-failure 0.5) for the life of the entry, so the same
+        # content would never be re-evaluated after the outage clears.
+        if from_model:
+            self._safety_cache[key] = score
+            if len(self._safety_cache) > self._safety_cache_size:
+                self._safety_cache.popitem(last=False)
+        return score
+
+    def _check_safety_uncached(self, content: str):
+        """Evaluate content with the model; see check_safety for the cached entry point.
+
+        Returns (score, from_model): from_model is False for the
+        error-path defaults, which must not enter the cache.
+        """
+        # Local short-circuit: most traffic is obviously safe, and the
+        # model round-trip dominates the cost of this check
+        if self.local_prefilter and _RISK_MARKER_PATTERN.search(content) is None:
+            # Deterministic on the content, so safe to cache
+            return 0.0, True
         try:
             # Use a separate Gemini call to evaluate content
             risk_detection_prompt = f"""
@@ -116,16 +191,26 @@ class ContentFilterGuardrail(BaseGuardrail):
             
             # Extract JSON response
             try:
-                # Find JSON in the response (model might add extra text)
+                # Find JSON in the response (model might add extra text).
+                # raw_decode stops at the end of the first valid JSON
+                # value, so trailing prose is tolerated without the
+                # backward rfind pass over the whole response.
                 json_start = safety_result.find('{')
-                json_end = safety_result.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    safety_json = safety_result[json_start:json_end]
-                    safety_data = json.loads(safety_json)
-                    
+                if json_start >= 0:
+                    if _orjson is not None:
+                        # orjson has no raw_decode; try it on the whole
+                        # remainder (the common, compliant case) and fall
+                        # back to raw_decode when prose follows the JSON
+                        try:
+                            safety_data = _orjson.loads(safety_result[json_start:])
+                        except ValueError:
+                            safety_data, _ = _JSON_DECODER.raw_decode(safety_result, json_start)
+                    else:
+                        safety_data, _ = _JSON_DECODER.raw_decode(safety_result, json_start)
+
                     # Return overall risk or calculate it
                     if "overall_risk" in safety_data:
-                        return float(safety_data["overall_risk"])
+                        return float(safety_data["overall_risk"]), True
                     else:
                         # Calculate overall risk as maximum of individual risks
                         risks = [
@@ -134,14 +219,17 @@ class ContentFilterGuardrail(BaseGuardrail):
                             safety_data.get("unethical", {}).get("score", 0),
                             safety_data.get("sensitive", {}).get("score", 0)
                         ]
-                        return max([float(r) for r in risks if r is not None])
-                        
+                        return max([float(r) for r in risks if r is not None]), True
+
             except Exception as e:
                 logger.error(f"Failed to parse safety result JSON: {e}")
                 # Default to moderately risky if parsing fails
-                return 0.5
-                
+                return 0.5, False
+
+            # No JSON in the response at all; preserved as an uncached miss
+            return None, False
+
         except Exception as e:
             logger.error(f"Error in safety check: {e}")
             # Default to safe if check fails completely
-            return 0.0
+            return 0.0, False
@@ -7,6 +7,8 @@ Main entry point for the Gemini Guardrails Framework.
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Dict, Any, Optional, Union
 
 from .guardrails.base import BaseGuardrail
@@ -17,10 +19,34 @@ from .guardrails.sandbox import SandboxGuardrail
 from .gemini.client import GeminiClient
 from .utils.logging_utils import setup_logging
 
+# Optional fast JSON parser for config loading; stdlib json is the fallback
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 # Set up logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a guardrail config file, cached on (path, mtime).
+
+    Constructing several SafeGeminiClient instances against the same
+    unchanged file — common in notebook and serverless reuse — hits the
+    cache instead of reopening and re-parsing the JSON; editing the file
+    changes the mtime and invalidates the entry automatically. Callers
+    share the returned dict and must treat it as read-only.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
 class SafeGeminiClient:
     """
     A client for interacting with Google's Gemini models with enhanced safety guardrails.
@@ -60,14 +86,36 @@ class SafeGeminiClient:
         # Initialize guardrails
         self.guardrails = []
         self._init_guardrails()
-        
+
+        # Partitioned once so the request paths — including the
+        # per-interval circuit-breaker loop — iterate prefiltered lists
+        # instead of re-running isinstance/hasattr on every pass
+        self._pre_guardrails = [
+            g for g in self.guardrails
+            if isinstance(g, BaseGuardrail) and hasattr(g, 'preprocess')
+        ]
+        self._post_guardrails = [
+            g for g in self.guardrails
+            if isinstance(g, BaseGuardrail) and hasattr(g, 'postprocess')
+        ]
+        self._content_filters = [
+            g for g in self.guardrails if isinstance(g, ContentFilterGuardrail)
+        ]
+        # Pure checks never rewrite the prompt, so they can run
+        # concurrently; transforming guardrails stay sequential
+        self._check_pre_guardrails = [
+            g for g in self._pre_guardrails if not g.transforms_prompt
+        ]
+        self._transform_pre_guardrails = [
+            g for g in self._pre_guardrails if g.transforms_prompt
+        ]
+
         logger.info("SafeGeminiClient initialized with %d guardrails", len(self.guardrails))
     
     def _load_config(self) -> Dict[str, Any]:
         """Load and parse configuration from the JSON file."""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            config = _load_config_cached(self.config_path, os.path.getmtime(self.config_path))
             logger.debug("Configuration loaded from %s", self.config_path)
             return config
         except Exception as e:
@@ -100,7 +148,8 @@ class SafeGeminiClient:
                 ContentFilterGuardrail(
                     client=self.client,
                     risk_threshold=guardrail_config.get('content_filter', {}).get('risk_threshold', 0.7),
-                    categories=guardrail_config.get('content_filter', {}).get('categories', [])
+                    categories=guardrail_config.get('content_filter', {}).get('categories', []),
+                    local_prefilter=guardrail_config.get('content_filter', {}).get('local_prefilter', False)
                 )
             )
         
@@ -131,6 +180,44 @@ class SafeGeminiClient:
                 )
             )
     
+    def _run_preprocess(self, prompt: str, role: str):
+        """
+        Apply all preprocess guardrails to a prompt.
+
+        Pure-check guardrails (transforms_prompt is False) run
+        concurrently: the content filter's evaluation call and the
+        injection detector's regex pass are independent, so preprocess
+        latency is the slowest check instead of their sum. Transforming
+        guardrails then run sequentially in registration order, threading
+        the rewritten prompt through.
+
+        Returns:
+            tuple: (blocking guardrail or None, processed prompt)
+        """
+        checks = self._check_pre_guardrails
+        if len(checks) > 1:
+            executor = ThreadPoolExecutor(max_workers=len(checks))
+            try:
+                futures = {
+                    executor.submit(g.preprocess, prompt, role=role): g
+                    for g in checks
+                }
+                for future in as_completed(futures):
+                    if future.result() is None:
+                        return futures[future], prompt
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+        elif checks:
+            if checks[0].preprocess(prompt, role=role) is None:
+                return checks[0], prompt
+
+        for guardrail in self._transform_pre_guardrails:
+            prompt_result = guardrail.preprocess(prompt, role=role)
+            if prompt_result is None:
+                return guardrail, prompt
+            prompt = prompt_result
+        return None, prompt
+
     def generate(self, prompt: str, role: str = "user") -> str:
         """
         Generate a safe response from Gemini using all configured guardrails.
@@ -145,19 +232,11 @@ class SafeGeminiClient:
         """
         logger.info("Processing prompt with role: %s", role)
         
-        # Apply pre-processing guardrails
-        for guardrail in self.guardrails:
-            if isinstance(guardrail, BaseGuardrail) and hasattr(guardrail, 'preprocess'):
-                prompt_result = guardrail.preprocess(prompt, role=role)
-                
-                # If a guardrail returns None or a safety message, return it immediately
-                if prompt_result is None:
-                    safety_message = guardrail.get_safety_message()
-                    logger.warning("Guardrail %s blocked the prompt", guardrail.__class__.__name__)
-                    return safety_message
-                
-                # Otherwise, update the prompt with the processed version
-                prompt = prompt_result
+        # Apply pre-processing guardrails (pure checks run concurrently)
+        blocker, prompt = self._run_preprocess(prompt, role)
+        if blocker is not None:
+            logger.warning("Guardrail %s blocked the prompt", blocker.__class__.__name__)
+            return blocker.get_safety_message()
         
         # Generate response with the base model
         try:
@@ -167,18 +246,17 @@ class SafeGeminiClient:
             return "I apologize, but I encountered an error processing your request."
         
         # Apply post-processing guardrails
-        for guardrail in self.guardrails:
-            if isinstance(guardrail, BaseGuardrail) and hasattr(guardrail, 'postprocess'):
-                response_result = guardrail.postprocess(prompt, response, role=role)
-                
-                # If a guardrail blocks the response, return its safety message
-                if response_result is None:
-                    safety_message = guardrail.get_safety_message()
-                    logger.warning("Guardrail %s blocked the response", guardrail.__class__.__name__)
-                    return safety_message
-                
-                # Otherwise, update the response with the processed version
-                response = response_result
+        for guardrail in self._post_guardrails:
+            response_result = guardrail.postprocess(prompt, response, role=role)
+
+            # If a guardrail blocks the response, return its safety message
+            if response_result is None:
+                safety_message = guardrail.get_safety_message()
+                logger.warning("Guardrail %s blocked the response", guardrail.__class__.__name__)
+                return safety_message
+
+            # Otherwise, update the response with the processed version
+            response = response_result
         
         return response
     
@@ -194,52 +272,71 @@ class SafeGeminiClient:
         Yields:
             str: Tokens of the safe response or safety message
         """
-        # Apply pre-processing guardrails
-        for guardrail in self.guardrails:
-            if isinstance(guardrail, BaseGuardrail) and hasattr(guardrail, 'preprocess'):
-                prompt_result = guardrail.preprocess(prompt, role=role)
-                
-                # If a guardrail returns None or a safety message, yield it immediately
-                if prompt_result is None:
-                    safety_message = guardrail.get_safety_message()
-                    logger.warning("Guardrail %s blocked the prompt", guardrail.__class__.__name__)
-                    yield safety_message
-                    return
-                
-                # Otherwise, update the prompt with the processed version
-                prompt = prompt_result
+        # Apply pre-processing guardrails (pure checks run concurrently)
+        blocker, prompt = self._run_preprocess(prompt, role)
+        if blocker is not None:
+            logger.warning("Guardrail %s blocked the prompt", blocker.__class__.__name__)
+            yield blocker.get_safety_message()
+            return
         
         # Configure circuit breaker if enabled
         circuit_breaker_config = self.config.get('guardrails', {}).get('circuit_breaker', {})
         if circuit_breaker_config.get('enabled', False):
             check_interval = circuit_breaker_config.get('check_interval', 20)
             safety_threshold = circuit_breaker_config.get('safety_threshold', 0.8)
-            
+            min_check_delta = circuit_breaker_config.get('min_check_delta', 64)
+            # Characters re-scored from before the last check, so content
+            # straddling two check windows is still seen in one piece
+            check_overlap = circuit_breaker_config.get('check_overlap', 64)
+
             # Stream response with circuit breaker
             response_buffer = ""
             token_count = 0
-            
+            last_checked_len = 0
+            # Interval checks score only the text after last_idx: the
+            # already-scored prefix never changes, and re-sending the
+            # whole growing buffer made the total evaluation cost
+            # quadratic in the stream length. The rolling risk is the
+            # maximum score across windows; a final full-buffer check
+            # runs once when the stream closes.
+            last_idx = 0
+            rolling_score = None
+
             try:
                 for token in self.client.generate_stream(prompt):
                     response_buffer += token
                     token_count += 1
-                    
-                    # Check safety at intervals
-                    if token_count % check_interval == 0:
+
+                    # Check safety at intervals, but only once enough new
+                    # text has accumulated to make re-scoring worthwhile
+                    if (token_count % check_interval == 0
+                            and len(response_buffer) - last_checked_len > min_check_delta):
+                        last_checked_len = len(response_buffer)
                         is_safe = True
-                        for guardrail in self.guardrails:
-                            if isinstance(guardrail, ContentFilterGuardrail):
-                                safety_score = guardrail.check_safety(response_buffer)
-                                if safety_score < safety_threshold:
-                                    is_safe = False
-                                    break
-                        
+                        for guardrail in self._content_filters:
+                            safety_score = guardrail.check_safety(response_buffer[last_idx:])
+                            if rolling_score is None or safety_score > rolling_score:
+                                rolling_score = safety_score
+                            if rolling_score < safety_threshold:
+                                is_safe = False
+                                break
+                        last_idx = max(0, len(response_buffer) - check_overlap)
+
                         if not is_safe:
                             yield "\n\n[Generation stopped due to safety concerns]"
                             return
-                    
+
                     yield token
-            
+
+                # Final check over the whole buffer once the stream has
+                # closed, catching anything the windowed checks missed
+                if response_buffer:
+                    for guardrail in self._content_filters:
+                        safety_score = guardrail.check_safety(response_buffer)
+                        if safety_score < safety_threshold:
+                            yield "\n\n[Generation stopped due to safety concerns]"
+                            return
+
             except Exception as e:
                 logger.error("Error streaming response: %s", str(e))
                 yield "\n\nI apologize, but I encountered an error processing your request."
@@ -18,14 +18,14 @@ def read_base64_pdf(base64_pdf):
     # Create a BytesIO object
     pdf_file = io.BytesIO(pdf_bytes)
     
-    # Extract text using pdfplumber
-    extracted_text = ""
+    # Extract text using pdfplumber; collect pages and join once instead
+    # of growing a string with +=, which rebuilds the whole accumulator
+    # per page and turns large documents quadratic
     with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            extracted_text += page.extract_text() or ""
-            extracted_text += "\n\n"  # Add spacing between pages
-    
-    return extracted_text
+        # Spacing between pages (and after the last, as before)
+        parts = [(page.extract_text() or "") + "\n\n" for page in pdf.pages]
+
+    return "".join(parts)
 
 # Example usage
 if __name__ == "__main__":
@@ -6,4 +6,21 @@ def compute_safety_score(risk_dict):
     """
     if not risk_dict:
         return 0.0
-    return max(float(score) for score in risk_dict.values() if isinstance(score, (int, float, str)) and str(score).replace('.', '', 1).isdigit())
+    # Typed dispatch instead of the old str(score).replace('.', '', 1)
+    # .isdigit() probe, which allocated a formatted string per value just
+    # to reject non-numerics. Numeric strings are still accepted, via
+    # float() directly.
+    best = 0.0
+    for score in risk_dict.values():
+        if isinstance(score, (int, float)):
+            value = float(score)
+        elif isinstance(score, str):
+            try:
+                value = float(score)
+            except ValueError:
+                continue
+        else:
+            continue
+        if value > best:
+            best = value
+    return best